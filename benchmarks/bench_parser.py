@@ -0,0 +1,50 @@
+"""Benchmarks of construction, parsing and help rendering of synthetic parser trees.
+
+Run with: python benchmarks/bench_parser.py
+"""
+from declarative_parser.constructor_parser import docstring_analyzers
+
+from common import run
+from trees import trees, docstring
+
+
+def parse(parser, argv):
+    def run():
+        parser.reset()
+        parser.parse_args(argv)
+    return run
+
+
+def construct_and_attach(parser_class):
+    def run():
+        parser_class().attach_subparsers()
+    return run
+
+
+def benchmarks():
+    benchmarks = {}
+
+    for name, generate in trees.items():
+        parser_class, short, long = generate()
+        parser = parser_class()
+
+        benchmarks[f'{name}: construction'] = parser_class
+        benchmarks[f'{name}: construction + attach_subparsers'] = construct_and_attach(parser_class)
+        benchmarks[f'{name}: parse_args, short argv'] = parse(parser, short)
+        benchmarks[f'{name}: parse_args, long argv'] = parse(parser, long)
+
+        helped = parser_class()
+        helped.attach_subparsers()
+        benchmarks[f'{name}: help rendering'] = helped.parser.format_help
+
+    for convention, analyze in docstring_analyzers.items():
+        text = docstring(100, convention)
+        benchmarks[f'DocstringAnalyzer.analyze ({convention}, 100 arguments)'] = (
+            lambda analyze=analyze, text=text: analyze(text)
+        )
+
+    return benchmarks
+
+
+if __name__ == '__main__':
+    run(benchmarks())
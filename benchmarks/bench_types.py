@@ -0,0 +1,79 @@
+"""Micro-benchmarks for converters from :mod:`declarative_parser.types`.
+
+Run with: python benchmarks/bench_types.py
+"""
+import os
+from tempfile import NamedTemporaryFile
+
+from declarative_parser.types import (
+    one_of, Slice, Indices, Range, positive_int, n_tuple, dsv, cached,
+    deferred, streamed, swept, Choices, PrefetchedFileType, mapped_file
+)
+
+from common import run
+
+
+def mixed_inputs(converter, inputs):
+    def run():
+        for value in inputs:
+            converter(value)
+    return run
+
+
+def temporary_file(size=2 ** 16):
+    with NamedTemporaryFile(delete=False, suffix='.txt') as file:
+        file.write(b'0123456789\n' * (size // 11))
+    return file.name
+
+
+def read_prefetched(converter, path):
+    def run():
+        converter(path).read()
+    return run
+
+
+def read_mapped(path):
+    def run():
+        with mapped_file(path) as file:
+            file[:]
+    return run
+
+
+def benchmarks(path):
+    # the common case is the last type on the list
+    inputs = ['1,2,3', '0', '4,5', '1:2', '7']
+
+    unguarded = one_of(Slice, Range, Indices)
+    guarded = one_of(
+        (Slice, lambda string: ':' in string),
+        (Range, lambda string: '-' in string),
+        Indices
+    )
+    choices = Choices([f'choice_{i}' for i in range(1000)])
+
+    return {
+        'one_of (no guards), mixed inputs': mixed_inputs(unguarded, inputs),
+        'one_of (predicate guards), mixed inputs': mixed_inputs(guarded, inputs),
+        'Slice, 2 items': mixed_inputs(Slice, ['2:5']),
+        'Slice, 3 items': mixed_inputs(Slice, ['5:2:-1']),
+        'Indices, 10 items': mixed_inputs(Indices, [','.join(map(str, range(10)))]),
+        'Range': mixed_inputs(Range, ['1-100']),
+        'positive_int': mixed_inputs(positive_int, ['42']),
+        'n_tuple(3)': mixed_inputs(n_tuple(3), [['1', '2', '3']]),
+        'dsv(int), 10 items': mixed_inputs(dsv(int), [','.join(map(str, range(10)))]),
+        'cached(int), repeated value': mixed_inputs(cached(int), ['42']),
+        'deferred(int)': mixed_inputs(deferred(int), ['42']),
+        'streamed(int), single value': mixed_inputs(streamed(int), ['42']),
+        'swept(int), 10 values': mixed_inputs(swept(int), [','.join(map(str, range(10)))]),
+        'Choices, membership of 1000': mixed_inputs(choices.__contains__, ['choice_999']),
+        'PrefetchedFileType, 64 KiB': read_prefetched(PrefetchedFileType(), path),
+        'mapped_file, 64 KiB': read_mapped(path),
+    }
+
+
+if __name__ == '__main__':
+    path = temporary_file()
+    try:
+        run(benchmarks(path))
+    finally:
+        os.remove(path)
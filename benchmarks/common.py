@@ -0,0 +1,83 @@
+"""Timing harness shared by the benchmarks.
+
+Results (best time per call, in seconds) can be saved to a JSON file
+and compared against results saved for another commit.
+"""
+import json
+import os
+import platform
+import subprocess
+from timeit import repeat
+
+
+def measure(function, number=None, repeats=5):
+    """Best (minimal) time of a single call, in seconds."""
+    if number is None:
+        # calibrate so that a single repeat takes at least ~0.1 s
+        number = 1
+        while min(repeat(function, number=number, repeat=1)) < 0.1 and number < 10 ** 6:
+            number *= 10
+    best = min(repeat(function, number=number, repeat=repeats))
+    return best / number
+
+
+def format_time(seconds):
+    for unit, scale in [('s', 1), ('ms', 1e-3), ('us', 1e-6)]:
+        if seconds >= scale:
+            return f'{seconds / scale:8.2f} {unit}'
+    return f'{seconds / 1e-9:8.2f} ns'
+
+
+def run(benchmarks, selected=None, number=None):
+    """Run benchmarks (name -> function), printing and returning the results."""
+    results = {}
+    for name, function in benchmarks.items():
+        if selected and selected not in name:
+            continue
+        results[name] = measure(function, number=number)
+        print(f'{name:<64} {format_time(results[name])}')
+    return results
+
+
+def current_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(results, path):
+    data = {
+        'commit': current_commit(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+    with open(path, 'w') as file:
+        json.dump(data, file, indent=2, sort_keys=True)
+
+
+def compare(results, path, threshold=1.2):
+    """Print ratios of current to saved times; return names of regressed benchmarks."""
+    with open(path) as file:
+        saved = json.load(file)
+
+    print(f'\nCompared to {saved["commit"] or path} (python {saved["python"]}):')
+    regressed = []
+    for name, seconds in results.items():
+        before = saved['results'].get(name)
+        if not before:
+            continue
+        ratio = seconds / before
+        marker = ''
+        if ratio > threshold:
+            marker = '  slower'
+            regressed.append(name)
+        elif ratio < 1 / threshold:
+            marker = '  faster'
+        print(f'{name:<64} {ratio:6.2f}x{marker}')
+    return regressed
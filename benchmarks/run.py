@@ -0,0 +1,52 @@
+"""Run all benchmarks, optionally saving or comparing the results.
+
+Example (comparing two commits)::
+
+    git checkout main
+    python benchmarks/run.py --save main.json
+    git checkout feature
+    python benchmarks/run.py --compare main.json
+
+Exits with status 1 if any benchmark got slower than the threshold.
+"""
+import argparse
+import os
+import sys
+
+import bench_parser
+import bench_types
+from common import compare, run, save
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--save', help='path of JSON file to save the results to')
+    parser.add_argument('--compare', help='path of JSON file with results to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='ratio of times considered a regression')
+    parser.add_argument('--filter', help='only run benchmarks with names containing this text')
+    parser.add_argument('--number', type=int, help='calls per repeat (calibrated by default)')
+    options = parser.parse_args(argv)
+
+    path = bench_types.temporary_file()
+    try:
+        benchmarks = {
+            **bench_parser.benchmarks(),
+            **bench_types.benchmarks(path)
+        }
+        results = run(benchmarks, selected=options.filter, number=options.number)
+    finally:
+        os.remove(path)
+
+    if options.save:
+        save(results, options.save)
+
+    if options.compare:
+        regressed = compare(results, options.compare, options.threshold)
+        if regressed:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
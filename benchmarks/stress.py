@@ -0,0 +1,134 @@
+"""Scalability stress harness for large parser trees.
+
+Generates trees of increasing depth (up to 50 levels of nested parsers)
+and breadth (up to 10k arguments or sub-commands), measures how time of
+construction and parsing, and the retained memory grow with the size,
+and fails (exits with 1) if the growth is faster than the stated bound.
+
+The growth is estimated as the exponent k in time ~ size^k, fitted
+(least squares, in log-log scale) to the largest sizes, where the fixed
+costs matter the least. Bounds leave a margin for the noise: 1.5 for
+linear growth, 2.5 for quadratic.
+
+Run with: python benchmarks/stress.py [--max-size 1000]
+"""
+import argparse
+import sys
+from collections import namedtuple
+from math import log
+
+from bench_parser import parse
+from common import measure, format_time
+from trees import deep_tree, wide_tree, subcommands_tree
+
+
+LINEAR = 1.5
+QUADRATIC = 2.5
+
+Scenario = namedtuple('Scenario', 'name generate sizes bounds')
+
+
+scenarios = [
+    Scenario(
+        'depth (nested parsers)', deep_tree, [5, 10, 20, 30, 40, 50],
+        {
+            # each level deep-copies its child once: a recursive
+            # re-copying of the whole subtree would be quadratic
+            'construction': LINEAR,
+            'memory': LINEAR,
+            'parse, short argv': LINEAR,
+            # each level groups the arguments of all the levels below it
+            'parse, long argv': QUADRATIC,
+        }
+    ),
+    Scenario(
+        'breadth (arguments)', wide_tree, [100, 300, 1000, 3000, 10000],
+        {
+            'construction': LINEAR,
+            'memory': LINEAR,
+            'parse, short argv': LINEAR,
+            # argparse looks up the position of the next option string
+            # linearly for each of the options given
+            'parse, long argv': QUADRATIC,
+        }
+    ),
+    Scenario(
+        'breadth (sub-commands)', subcommands_tree, [100, 300, 1000, 3000, 10000],
+        {
+            'construction': LINEAR,
+            'memory': LINEAR,
+            'parse, short argv': LINEAR,
+            'parse, long argv': LINEAR,
+        }
+    ),
+]
+
+
+def growth_exponent(sizes, values, points=3):
+    """Slope of log(value) against log(size), fitted to the largest sizes."""
+    pairs = [
+        (log(size), log(value))
+        for size, value in list(zip(sizes, values))[-points:]
+        if value > 0
+    ]
+    if len(pairs) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in pairs) / len(pairs)
+    mean_y = sum(y for _, y in pairs) / len(pairs)
+    covariance = sum((x - mean_x) * (y - mean_y) for x, y in pairs)
+    variance = sum((x - mean_x) ** 2 for x, _ in pairs)
+    return covariance / variance
+
+
+def measure_tree(generate, size, repeats):
+    parser_class, short, long = generate(size)
+    parser = parser_class()
+    return {
+        'construction': measure(parser_class, repeats=repeats),
+        'memory': parser.memory_report().total,
+        'parse, short argv': measure(parse(parser, short), repeats=repeats),
+        'parse, long argv': measure(parse(parser, long), repeats=repeats),
+    }
+
+
+def run_scenario(scenario, max_size=None, repeats=3):
+    """Measure the scenario, print a report and return names of metrics exceeding bounds."""
+    sizes = [size for size in scenario.sizes if not max_size or size <= max_size]
+    results = [measure_tree(scenario.generate, size, repeats) for size in sizes]
+
+    print(f'\n{scenario.name}, sizes: {", ".join(map(str, sizes))}')
+    failed = []
+
+    for metric, bound in scenario.bounds.items():
+        values = [result[metric] for result in results]
+        exponent = growth_exponent(sizes, values)
+        status = 'ok' if exponent <= bound else 'FAILED'
+        if status != 'ok':
+            failed.append(f'{scenario.name}: {metric}')
+        shown = [
+            f'{value / 2 ** 10:.0f} KiB' if metric == 'memory' else format_time(value).strip()
+            for value in values
+        ]
+        print(f'  {metric:<20} growth ~n^{exponent:.2f} (bound n^{bound})  {status:<6} [{", ".join(shown)}]')
+
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--max-size', type=int, help='skip sizes (depths or breadths) above this')
+    parser.add_argument('--repeats', type=int, default=3, help='repeats of each measurement')
+    options = parser.parse_args(argv)
+
+    failed = []
+    for scenario in scenarios:
+        failed.extend(run_scenario(scenario, options.max_size, options.repeats))
+
+    if failed:
+        print('\nGrowth above the bounds in:\n  ' + '\n  '.join(failed))
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Generators of synthetic parser trees for benchmarks.
+
+Each generator returns a tuple: (parser class, short argv, long argv).
+"""
+from declarative_parser import Parser, Argument
+from declarative_parser.constructor_parser import ClassParser
+
+
+def make_parser(name, attributes, translucent=False, docstring=None):
+    namespace = dict(attributes)
+    namespace['__doc__'] = docstring or f'Synthetic parser {name}.'
+    if translucent:
+        namespace['__pull_to_namespace_above__'] = True
+        namespace['__skip_if_absent__'] = False
+    return type(name, (Parser,), namespace)
+
+
+def arguments(count, prefix='option'):
+    return {
+        f'{prefix}_{i}': Argument(
+            type=int if i % 2 else str,
+            default=i,
+            help=f'Synthetic argument number {i}'
+        )
+        for i in range(count)
+    }
+
+
+def wide_tree(width):
+    """A single parser with `width` arguments."""
+    parser = make_parser('Wide', arguments(width))
+    short = ['--option_1', '1']
+    long = [
+        token
+        for i in range(width)
+        for token in [f'--option_{i}', str(i)]
+    ]
+    return parser, short, long
+
+
+def deep_tree(depth, width=3):
+    """A chain of `depth` sub-parsers, each with `width` arguments."""
+    child = None
+    for level in reversed(range(depth)):
+        attributes = arguments(width, prefix=f'level_{level}')
+        if child:
+            attributes[f'sub_{level + 1}'] = child()
+        child = make_parser(f'Level{level}', attributes)
+
+    short = ['--level_0_1', '1']
+    long = []
+    for level in range(depth):
+        if level:
+            long.append(f'sub_{level}')
+        long.extend([f'--level_{level}_1', '1'])
+    return child, short, long
+
+
+def translucent_tree(count, width=5):
+    """A parser with `count` translucent sub-parsers, each with `width` arguments."""
+    attributes = {
+        f'group_{i}': make_parser(
+            f'Group{i}', arguments(width, prefix=f'group_{i}'), translucent=True
+        )()
+        for i in range(count)
+    }
+    parser = make_parser('Translucent', attributes)
+    short = ['--group_0_1', '1']
+    long = [
+        token
+        for i in range(count)
+        for token in [f'--group_{i}_1', '1']
+    ]
+    return parser, short, long
+
+
+def subcommands_tree(count, width=2):
+    """A parser with `count` sub-parsers (sub-commands), each with `width` arguments."""
+    command = make_parser('Command', arguments(width))()
+    attributes = {f'command_{i}': command for i in range(count)}
+    parser = make_parser('Commands', attributes)
+    short = [f'command_{count - 1}', '--option_1', '1']
+    long = [
+        token
+        for i in range(count)
+        for token in [f'command_{i}', '--option_1', '1']
+    ]
+    return parser, short, long
+
+
+def constructor_source(name, count, convention='google'):
+    parameters = ', '.join(f'parameter_{i}: int = {i}' for i in range(count))
+    if convention == 'google':
+        section = '\n'.join(
+            f'            parameter_{i}: description of parameter {i}'
+            for i in range(count)
+        )
+        docstring = f'Synthetic class.\n\n        Args:\n{section}\n        '
+    elif convention == 'numpy':
+        section = '\n'.join(
+            f'        parameter_{i}\n            description of parameter {i}'
+            for i in range(count)
+        )
+        docstring = f'Synthetic class.\n\n        Parameters\n        ----------\n{section}\n        '
+    else:
+        section = '\n'.join(
+            f'        :param parameter_{i}: description of parameter {i}'
+            for i in range(count)
+        )
+        docstring = f'Synthetic class.\n\n{section}\n        '
+    return (
+        f'class {name}:\n'
+        f'    def __init__(self, {parameters}):\n'
+        f'        """{docstring}"""\n'
+    )
+
+
+def synthetic_class(count, convention='google'):
+    """A class with `count` documented constructor parameters."""
+    namespace = {}
+    exec(constructor_source('Synthetic', count, convention), namespace)
+    return namespace['Synthetic']
+
+
+def constructor_tree(count, parameters=10):
+    """A parser with `count` ClassParser sub-parsers, each of class with `parameters` parameters."""
+    constructor = synthetic_class(parameters)
+    attributes = {
+        f'class_{i}': ClassParser(constructor)
+        for i in range(count)
+    }
+    parser = make_parser('Constructors', attributes)
+    short = ['class_0', '--parameter_1', '1']
+    long = [
+        token
+        for i in range(count)
+        for token in [f'class_{i}', '--parameter_1', '1']
+    ]
+    return parser, short, long
+
+
+def docstring(count, convention):
+    """Docstring of `__init__` of a synthetic class, in given convention."""
+    return synthetic_class(count, convention).__init__.__doc__
+
+
+trees = {
+    'wide (1000 arguments)': lambda: wide_tree(1000),
+    'deep (20 levels)': lambda: deep_tree(20),
+    'translucent (50 sub-parsers)': lambda: translucent_tree(50),
+    'constructors (50 sub-parsers)': lambda: constructor_tree(50),
+}
@@ -0,0 +1,171 @@
+import inspect
+import os
+import pickle
+from functools import lru_cache, wraps
+from hashlib import sha256
+from inspect import isawaitable
+from tempfile import NamedTemporaryFile
+
+
+def default_directory():
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(cache_home, 'declarative_parser')
+
+
+def stable_repr(value):
+    """Representation of value which does not change between the runs.
+
+    Only basic types (and containers of those) are supported,
+    for others TypeError is raised.
+    """
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return f'{type(value).__name__}({", ".join(map(stable_repr, value))})'
+    if isinstance(value, (set, frozenset)):
+        return f'set({", ".join(sorted(map(stable_repr, value)))})'
+    if isinstance(value, dict):
+        items = sorted(f'{stable_repr(key)}: {stable_repr(item)}' for key, item in value.items())
+        return f'dict({", ".join(items)})'
+    raise TypeError(f'Cannot create a stable representation of {type(value).__name__}')
+
+
+@lru_cache(maxsize=None)
+def class_source(cls):
+    try:
+        return inspect.getsource(cls)
+    except (OSError, TypeError):
+        return cls.__qualname__
+
+
+def cache_key(parser, unknown_args, ignore=()):
+    """Hash of the parser class source and of the values of its arguments."""
+    values = [
+        f'{name}={stable_repr(getattr(parser.namespace, name, None))}'
+        for name in sorted(parser.all_arguments)
+        if name not in ignore
+    ]
+    text = '\n'.join([class_source(type(parser)), *values, stable_repr(list(unknown_args))])
+    return sha256(text.encode()).hexdigest()
+
+
+def load(path):
+    try:
+        with open(path, 'rb') as file:
+            data = pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        return None
+    # mark as recently used
+    os.utime(path)
+    return data
+
+
+def store(path, data, max_size):
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    # write to a temporary file first, so readers never see partial files
+    file = NamedTemporaryFile(dir=directory, delete=False, suffix='.tmp')
+    try:
+        with file:
+            pickle.dump(data, file)
+        os.replace(file.name, path)
+    except BaseException:
+        os.remove(file.name)
+        raise
+
+    evict(directory, max_size)
+
+
+def evict(directory, max_size):
+    """Remove the least recently used files until the total size is below max_size."""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.name.endswith('.pickle'):
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+
+    for _, size, path in sorted(entries):
+        if total <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def cached_produce(directory=None, max_size=2 ** 30, ignore=()):
+    """Decorator for `Parser.produce`, storing its products on disk.
+
+    The products (attributes added to, or changed in the namespace by
+    `produce`) are stored in the `directory`, keyed by a hash of values
+    of the parser's arguments and of the source of the parser class.
+    When `produce` is called with the same values again, the stored
+    products are loaded instead of being rebuilt.
+
+    Values of arguments need to be of basic types (see :func:`stable_repr`),
+    otherwise the cache is not used; exclude arguments which should not
+    (or cannot) be a part of the key with `ignore`. Products which cannot
+    be pickled are not stored.
+
+    Example::
+
+        class ReferenceIndex(Parser):
+            reference = Argument()
+
+            @cached_produce(max_size=10 * 2 ** 30)
+            def produce(self, unknown_args):
+                self.namespace.index = build_index(self.namespace.reference)
+                return self.namespace
+
+    Args:
+        directory: where to store the products; by default
+            in `declarative_parser` in the user cache directory
+        max_size: total size (in bytes) of stored products, above
+            which the least recently used products will be removed
+        ignore: names of arguments to exclude from the key
+    """
+
+    def decorator(produce):
+
+        @wraps(produce)
+        def cached(self, unknown_args):
+            try:
+                key = cache_key(self, unknown_args, ignore)
+            except TypeError:
+                return produce(self, unknown_args)
+
+            path = os.path.join(directory or default_directory(), key + '.pickle')
+            stored = load(path)
+
+            if stored is not None:
+                product, remaining_args = stored
+                for name, value in product.items():
+                    setattr(self.namespace, name, value)
+                unknown_args[:] = remaining_args
+                return self.namespace
+
+            before = dict(vars(self.namespace))
+            opts = produce(self, unknown_args)
+
+            if isawaitable(opts):
+                return opts
+
+            product = {
+                name: value
+                for name, value in vars(self.namespace).items()
+                if name not in before or before[name] is not value
+            }
+            try:
+                store(path, (product, list(unknown_args)), max_size)
+            except (pickle.PicklingError, TypeError, AttributeError, OSError):
+                pass
+
+            return opts
+
+        return cached
+
+    return decorator
@@ -1,8 +1,18 @@
 import inspect
 import re
+from argparse import ArgumentTypeError
 from collections import defaultdict
+from copy import copy
+from functools import lru_cache, partial
 
+from .execution import bounded_map, call_with_namespace
 from .parser import Parser, Argument
+from .types import Choices
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 
 class DocstringAnalyzer:
@@ -113,6 +123,60 @@ docstring_analyzers = {
 }
 
 
+@lru_cache(maxsize=None)
+def generate_builder(constructor, names, nested, var_keyword=False):
+    """Generate a function calling constructor with values from a namespace.
+
+    Args:
+        constructor: a class or function to be called
+        names: names of parameters to be read from the namespace
+        nested: pairs of (name, builder) for parameters which
+            should be built from nested namespaces (of sub-parsers)
+        var_keyword: should remaining namespace values be passed too?
+    """
+    builders = dict(nested)
+    parameters = [
+        f'{name}=build_{name}(namespace.{name})'
+        if name in builders else
+        f'{name}=namespace.{name}'
+        for name in names
+    ]
+    if var_keyword:
+        parameters.append(
+            f'**{{key: value for key, value in vars(namespace).items() if key not in {names!r}}}'
+        )
+    scope = {f'build_{name}': builder for name, builder in builders.items()}
+    scope['constructor'] = constructor
+
+    build = eval(f'lambda namespace: constructor({", ".join(parameters)})', scope)
+
+    def builder(namespace):
+        return None if namespace is None else build(namespace)
+
+    return builder
+
+
+def convert_column(converter, column):
+    """Convert all values in a column with given type converter.
+
+    If numpy is available, columns of int, float and bool
+    type are converted with numpy, in a single step (unless
+    the values overflow the numpy types).
+    """
+    if not converter:
+        return list(column)
+    try:
+        if numpy and converter in (int, float, bool):
+            try:
+                return numpy.asarray(column).astype(converter)
+            except OverflowError:
+                # too big for the numpy dtype; Python ints have no limit
+                pass
+        return [converter(value) for value in column]
+    except (TypeError, ValueError) as e:
+        raise ArgumentTypeError(*e.args)
+
+
 def is_set(value):
     return not (value == inspect._empty)
 
@@ -148,6 +212,11 @@ class ConstructorParser(Parser):
         options, remaining_unknown_args = parser.parse_known_args(unknown_args)
 
         program = parser.constructor(**vars(options))
+
+    or, to call the constructor (also for nested constructor
+    sub-parsers) without creating intermediate dictionaries::
+
+        program = parser.parse_into(unknown_args)
     """
 
     @property
@@ -179,12 +248,31 @@ class ConstructorParser(Parser):
                 custom keyword arguments to be passed to Parser
         """
         self.constructor = constructor
+        self._builder = None
         restricted_names = ['name']
 
-        # add arguments defined in the class of constructor
+        # arguments and sub-parsers deduced from the constructor are kept
+        # aside (not set as attributes), so that they cannot collide with
+        # attributes and methods of the parser
+        self._deduced = {}
+
+        # add arguments defined in the class of constructor (or as
+        # attributes of the function); the arguments are shared by all
+        # parsers of the constructor, so this parser binds own copies
+        copies = {}
+
         for name, attribute in vars(constructor).items():
-            if isinstance(attribute, Parser) or isinstance(attribute, Argument):
-                setattr(self, name, attribute)
+            if isinstance(attribute, Argument):
+                argument = copies[id(attribute)] = copy(attribute)
+                argument.name = argument.name or name
+                self._deduced[name] = argument
+            elif isinstance(attribute, Parser):
+                self._deduced[name] = attribute
+
+        # link the copies with the copies of their partners
+        for argument in copies.values():
+            if argument.as_many_as is not None and id(argument.as_many_as) in copies:
+                argument.as_many_as = copies[id(argument.as_many_as)]
 
         # introspect method.__init__
         signature = inspect.signature(constructor)
@@ -199,23 +287,178 @@ class ConstructorParser(Parser):
                 continue
             if name in restricted_names:
                 raise ValueError(f'"{name}" cannot be used as a name of argument')
-            if not hasattr(self, name):
-                argument = Argument(
+            # definitions from the constructor, or from the class of the parser
+            defined = self._deduced.get(name) or getattr(type(self), name, None)
+
+            if not isinstance(defined, (Argument, Parser)):
+                self._deduced[name] = Argument(
                     default=empty_to_none(parameter.default),
                     type=empty_to_none(parameter.annotation),
                     optional=is_set(parameter.default),
                     help=docstring_help.get(name, None)
 
                 )
-                setattr(self, name, argument)
-            else:
-                argument = getattr(self, name)
-                if not hasattr(argument, 'help') or not argument.help:
-                    argument.help = docstring_help.get(name, None)
+            elif isinstance(defined, Argument) and not defined.help:
+                if name not in self._deduced:
+                    # shared by all instances of the parser class
+                    defined = copy(defined)
+                defined.help = docstring_help.get(name, None)
+                self._deduced[name] = defined
 
         super().__init__(**kwargs)
 
-    def __deepcopy__(self, memodict={}):
+    def _declared_attributes(self):
+        attributes = dict(super()._declared_attributes())
+        attributes.update(self._deduced)
+        return sorted(attributes.items())
+
+    def make_builder(self):
+        """Create function calling the constructor with values from parsed namespace.
+
+        Sub-parsers created from constructors are built too (as nested
+        objects). The function is generated once for each constructor
+        and set of its parameters.
+        """
+        names = []
+        nested = []
+        var_keyword = False
+
+        for name, parameter in inspect.signature(self.constructor).parameters.items():
+            if parameter.kind == parameter.VAR_KEYWORD:
+                var_keyword = True
+            if parameter.kind in [parameter.VAR_KEYWORD, parameter.VAR_POSITIONAL]:
+                continue
+            names.append(name)
+            sub_parser = self.subparsers.get(name)
+            if isinstance(sub_parser, ConstructorParser):
+                nested.append((name, sub_parser.make_builder()))
+
+        return generate_builder(self.constructor, tuple(names), tuple(nested), var_keyword)
+
+    def parse_into(self, args=None):
+        """Parse arguments (like :meth:`parse_args`) and call the constructor with them."""
+        if not self._builder:
+            self._builder = self.make_builder()
+        return self._builder(self.parse_args(args))
+
+    def convert_columns(self, columns):
+        """Convert and validate a table of raw values, column by column.
+
+        Each argument's `type` converter is applied to the whole column
+        at once; `choices` and `as_many_as` are validated column-wise.
+        Arguments with no column will be set to their default values.
+
+        Args:
+            columns: mapping of argument names to sequences of values
+                (each element being a list of values for arguments
+                accepting many values, i.e. with `nargs`)
+
+        Returns:
+            dict of converted columns (lists or numpy arrays)
+        """
+        unknown = set(columns) - set(self.all_arguments)
+        if unknown:
+            raise ValueError(f'Unknown columns: {", ".join(sorted(unknown))}')
+
+        lengths = {len(column) for column in columns.values()}
+        if len(lengths) > 1:
+            raise ValueError('All columns need to have the same length')
+        rows_count = lengths.pop() if lengths else 0
+
+        converted = {}
+
+        for name, argument in self.all_arguments.items():
+            if name not in columns:
+                if not argument.optional:
+                    raise ValueError(f'Column for required argument {name} is missing')
+                default = argument.default
+                converter = argument.kwargs.get('type')
+                # as in argparse, string defaults are converted with `type`
+                if isinstance(default, str) and converter:
+                    default = convert_column(converter, [default])[0]
+                converted[name] = [default] * rows_count
+                continue
+
+            converter = argument.kwargs.get('type')
+            column = columns[name]
+
+            if argument.kwargs.get('nargs') is not None:
+                converted[name] = [
+                    [converter(value) for value in values] if converter else list(values)
+                    for values in column
+                ]
+            else:
+                converted[name] = convert_column(converter, column)
+
+            choices = argument.kwargs.get('choices')
+            if choices is not None:
+                self.validate_choices(name, converted[name], choices, argument.kwargs.get('nargs'))
+
+        for argument in self.all_arguments.values():
+            if argument.as_many_as:
+                partners = converted[argument.as_many_as.name]
+                for myself, partner in zip(converted[argument.name], partners):
+                    argument.check_counts(myself, partner)
+
+        return converted
+
+    @staticmethod
+    def validate_choices(name, column, choices, nargs=None):
+        try:
+            allowed = choices if isinstance(choices, Choices) else frozenset(choices)
+        except TypeError:
+            allowed = choices
+        for i, values in enumerate(column):
+            for value in (values if nargs is not None else [values]):
+                if value not in allowed:
+                    raise ValueError(f'{name}: invalid choice {value!r} in row {i}')
+
+    def parse_columns(self, columns):
+        """Convert and validate a table of raw values, yielding keyword arguments.
+
+        See :meth:`convert_columns`. Yields a dict of keyword arguments
+        for the constructor for each row of the table::
+
+            for kwargs in parser.parse_columns({'base': ['2', '3']}):
+                result = parser.constructor(**kwargs)
+        """
+        converted = {
+            name: column.tolist() if hasattr(column, 'tolist') else column
+            for name, column in self.convert_columns(columns).items()
+        }
+        names = list(converted)
+        for row in zip(*converted.values()):
+            yield dict(zip(names, row))
+
+    def run_sweep(self, namespace, workers=None, backend='process', max_in_flight=None):
+        """Call the constructor for each combination of swept arguments.
+
+        The combinations are generated lazily (see :meth:`Parser.sweep`)
+        and processed in a pool of workers, with a bounded number of
+        tasks in flight (see :func:`~.execution.bounded_map`), so even
+        sweeps with millions of points can be run in constant memory.
+
+        Example::
+
+            options = parser.parse_args('--lr 0.1,0.01 --depth 2-6'.split())
+
+            for result in parser.run_sweep(options, workers=4):
+                print(result)
+        """
+        return bounded_map(
+            partial(call_with_namespace, self.constructor),
+            self.sweep(namespace),
+            workers=workers, backend=backend, max_in_flight=max_in_flight
+        )
+
+    def execute(self, args):
+        """Parse arguments and call the constructor with them in :meth:`map`."""
+        return self.parse_into(args)
+
+    def __reduce__(self):
+        return partial(self.__class__, self.constructor, **self.kwargs), ()
+
+    def __deepcopy__(self, memodict=None):
         return self.__class__(self.constructor, **self.kwargs)
 
 
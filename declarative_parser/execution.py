@@ -0,0 +1,97 @@
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait, FIRST_COMPLETED
+from copy import deepcopy
+from itertools import islice
+from os import cpu_count
+from threading import local
+
+
+executors = {
+    'process': ProcessPoolExecutor,
+    'thread': ThreadPoolExecutor
+}
+
+
+def bounded_map(
+        function, iterable, workers=None, backend='process', max_in_flight=None,
+        ordered=True, initializer=None, initargs=()
+):
+    """Map function over iterable in a pool, keeping a bounded number of tasks in flight.
+
+    The iterable is consumed lazily: a new item is only taken when there
+    is less than `max_in_flight` tasks submitted and not yet yielded,
+    so even huge (or infinite) iterables can be processed in constant
+    memory.
+
+    Args:
+        function: a callable to be applied; has to be picklable
+            (defined at module level) for the process backend
+        iterable: arguments for the function
+        workers: number of workers; defaults to the number of CPUs
+        backend: either 'process' or 'thread'
+        max_in_flight: how many tasks can be pending at once;
+            by default twice the number of workers
+        ordered: if False, results will be yielded as completed,
+            otherwise in the order of the iterable
+        initializer: called (with `initargs`) when a worker starts
+        initargs: arguments for the initializer
+    """
+    workers = workers or cpu_count() or 1
+    max_in_flight = max_in_flight or 2 * workers
+
+    executor = executors[backend](
+        max_workers=workers, initializer=initializer, initargs=initargs
+    )
+
+    with executor:
+        if ordered:
+            pending = deque()
+            for item in iterable:
+                if len(pending) >= max_in_flight:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(function, item))
+            while pending:
+                yield pending.popleft().result()
+        else:
+            pending = set()
+            for item in iterable:
+                if len(pending) >= max_in_flight:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        yield future.result()
+                pending.add(executor.submit(function, item))
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+
+def chunked(iterable, size):
+    """Split iterable into lists of given size (the last one may be shorter)."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def call_with_namespace(constructor, namespace):
+    return constructor(**vars(namespace))
+
+
+# each worker (process or thread) keeps its own, warm copy of the parser
+worker = local()
+
+
+def initialize_worker(parser):
+    worker.parser = deepcopy(parser)
+
+
+def execute_chunk(chunk):
+    parser = worker.parser
+    results = []
+    for args in chunk:
+        parser._reset()
+        results.append(parser.execute(args))
+    return results
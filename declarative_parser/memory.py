@@ -0,0 +1,141 @@
+import sys
+import tracemalloc
+from collections import namedtuple
+from contextlib import contextmanager
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+
+
+# shared code and definitions, not retained by the parser trees
+not_retained = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+
+
+def deep_size(obj, seen):
+    """Size of object and of all objects reachable from it, not counted yet.
+
+    Objects are counted only once (their ids are added to `seen`);
+    types, modules and functions are skipped.
+    """
+    size = 0
+    stack = [obj]
+
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, not_retained):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+
+        if hasattr(obj, '__dict__'):
+            stack.append(vars(obj))
+        for cls in type(obj).__mro__:
+            for slot in cls.__dict__.get('__slots__', ()):
+                if slot != '__dict__' and hasattr(obj, slot):
+                    stack.append(getattr(obj, slot))
+
+    return size
+
+
+class NodeMemory(namedtuple('NodeMemory', 'arguments help argparse namespace other')):
+    """Retained sizes (in bytes) of parts of a single parser."""
+
+    __slots__ = ()
+
+    @property
+    def total(self):
+        return sum(self)
+
+
+class MemoryReport(dict):
+    """Retained sizes of nodes of a parser tree, keyed by the path of node.
+
+    Each object is counted only once, in the first measured node which
+    references it (sub-parsers are measured before their parents); deep copies of sub-parsers, made by
+    :meth:`~.parser.Parser.bind_parser`, are reported as separate nodes.
+    """
+
+    @property
+    def total(self):
+        return sum(node.total for node in self.values())
+
+    def __str__(self):
+        header = f'{"node":<40} ' + ' '.join(f'{field:>10}' for field in (*NodeMemory._fields, 'total'))
+        lines = [header]
+        for path, node in self.items():
+            lines.append(f'{path:<40} ' + ' '.join(f'{size:>10}' for size in (*node, node.total)))
+        lines.append(f'{"total":<40} {self.total:>{11 * (len(NodeMemory._fields) + 1) - 1}}')
+        return '\n'.join(lines)
+
+
+def measure_node(parser, seen):
+    # including docstring-derived help of arguments of ConstructorParser
+    help_texts = [parser.parser.description, parser.parser.epilog]
+    help_texts.extend(argument.help for argument in parser.arguments.values())
+    help_texts = [text for text in help_texts if text]
+
+    return NodeMemory(
+        help=deep_size(help_texts, seen) - sys.getsizeof(help_texts),
+        arguments=deep_size(list(parser.arguments.values()), seen),
+        namespace=deep_size(parser.namespace, seen),
+        argparse=deep_size(parser.parser, seen),
+        other=sys.getsizeof(parser) + deep_size(vars(parser), seen),
+    )
+
+
+def memory_report(parser):
+    """Walk the tree of parsers, measuring retained size of each node."""
+    order = []
+    nodes = {}
+
+    def collect(parser, path):
+        order.append(path)
+        nodes[path] = parser
+        for name, subparser in parser.subparsers.items():
+            collect(subparser, f'{path} {name}')
+
+    collect(parser, parser._node_name)
+
+    # parsers are reported separately, never as a part of other node
+    seen = set(map(id, nodes.values()))
+    sizes = {}
+
+    # sub-parsers are measured first, so that their namespaces
+    # (nested in the namespace of the parent) are attributed to them
+    for path in reversed(order):
+        sizes[path] = measure_node(nodes[path], seen)
+
+    return MemoryReport((path, sizes[path]) for path in order)
+
+
+@contextmanager
+def allocation_budget(max_bytes):
+    """Fail (with AssertionError) if the code allocated more than `max_bytes` at peak.
+
+    Allocations are traced with :mod:`tracemalloc`; use it in tests,
+    to check the memory cost of constructing a parser, or of a parse::
+
+        with allocation_budget(2 * 2 ** 20):
+            parser = GeneratedParser()
+
+        with allocation_budget(100 * 2 ** 10):
+            parser.parse_args(argv)
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+    try:
+        yield
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        if started:
+            tracemalloc.stop()
+    allocated = peak - baseline
+    if allocated > max_bytes:
+        raise AssertionError(f'Allocated {allocated} bytes, above the budget of {max_bytes} bytes')
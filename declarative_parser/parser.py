@@ -1,12 +1,44 @@
 import argparse
+import asyncio
 import textwrap
-from collections import defaultdict
+from collections import defaultdict, namedtuple, OrderedDict
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import nullcontext
+from contextvars import ContextVar, copy_context
 from copy import deepcopy
+from functools import lru_cache, partial
+from inspect import isawaitable, iscoroutinefunction
+from itertools import product
+from os import PathLike
+from threading import Lock
 from traceback import print_exc
+from types import MappingProxyType
 from typing import Sequence
 
 import sys
 
+from .execution import bounded_map, chunked, execute_chunk, initialize_worker
+from .memory import memory_report
+from .profiling import Profile, active_profile, profiling_enabled, timed
+from .session import Session
+from .types import cached, deferred, streamed, Stream, Choices, swept, Sweep
+from .types import PrefetchedFileType, mapped_file
+
+
+class AsyncParsingRequired(TypeError):
+    """Coroutines were found when parsing with the synchronous parse_args()."""
+
+
+# coroutines returned by produce(), to be awaited by parse_args_async()
+pending_productions = ContextVar('pending_productions', default=None)
+
+# produce() calls of sub-parsers, to be run concurrently by their parent
+deferred_productions = ContextVar('deferred_productions', default=None)
+
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
 
 def group_arguments(args, group_names):
     """Group arguments into given groups + None group for all others"""
@@ -20,6 +52,38 @@ def group_arguments(args, group_names):
     return groups, groups[None]
 
 
+class PrefixIndex:
+    """Sorted index of names, for exact and prefix (abbreviation) lookups.
+
+    Exact lookups use a hash set; all names starting with given prefix
+    are found with a binary search, instead of scanning all the names.
+    """
+
+    def __init__(self, names):
+        self.names = sorted(names)
+        self.exact = frozenset(self.names)
+
+    def __contains__(self, name):
+        return name in self.exact
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __len__(self):
+        return len(self.names)
+
+    def matching(self, prefix):
+        """Return all names starting with given prefix (exact match first)."""
+        if prefix in self.exact:
+            return [prefix]
+        matches = []
+        i = bisect_left(self.names, prefix)
+        while i < len(self.names) and self.names[i].startswith(prefix):
+            matches.append(self.names[i])
+            i += 1
+        return matches
+
+
 class Argument:
     """Defines argument for `Parser`.
 
@@ -30,11 +94,24 @@ class Argument:
 
     Worth to mention that when used with :class:`~.constructor_parser.ConstructorParser`,
     `type` and `help` will be automatically deduced.
+
+    Large collections of `choices` (and choices given as a callable
+    or as a path to load lazily) are wrapped in :class:`~.types.Choices`,
+    for fast membership tests and short help messages.
     """
 
+    __slots__ = (
+        'name', 'short_name', 'optional', 'as_many_as',
+        'cache', 'lazy', 'stream', 'sweep', 'kwargs', 'default'
+    )
+
+    # choices collections larger than this will be wrapped in Choices
+    many_choices = 32
+
     def __init__(
             self, name=None, short=None, optional=True,
-            as_many_as: 'Argument'=None, **kwargs
+            as_many_as: 'Argument'=None, cache=None, lazy=False,
+            stream=False, sweep=False, **kwargs
     ):
         """
         Args:
@@ -49,6 +126,24 @@ class Argument:
             as_many_as:
                 if provided, will check if len() of the produced
                 value is equal to len() of the provided argument
+            cache:
+                if provided, results of `type` conversions will be
+                memoized, keeping up to given number of values;
+                see :func:`~.types.cached`
+            lazy:
+                if True, `type` conversion will be deferred until
+                the parsed value is accessed (see :class:`~.types.Lazy`);
+                a callable can be given instead to be used as a cheap
+                check, rejecting invalid values during parsing
+            stream:
+                if True, values will be read lazily from stdin ('-')
+                or from a response file ('@path'), see :func:`~.types.streamed`;
+                `as_many_as` checks involving streams are deferred
+                until the streams are exhausted
+            sweep:
+                if True, a list of values to sweep over can be given
+                (see :func:`~.types.swept`); use :meth:`Parser.sweep`
+                to expand the parsed namespace into all combinations
             **kwargs:
                 other keyword arguments which are
                 supported by `argparse.add_argument()`
@@ -57,6 +152,42 @@ class Argument:
         self.short_name = short
         self.optional = optional
         self.as_many_as = as_many_as
+        self.cache = cache
+
+        if cache and kwargs.get('type'):
+            kwargs['type'] = cached(kwargs['type'], maxsize=cache)
+
+        self.lazy = lazy
+
+        if lazy and kwargs.get('type'):
+            check = lazy if callable(lazy) else None
+            kwargs['type'] = deferred(kwargs['type'], check=check)
+
+        self.stream = stream
+
+        if stream:
+            if kwargs.get('nargs') is not None:
+                raise ValueError(
+                    f'Keyword argument `nargs` cannot be used '
+                    f'with a streamed argument named "{name}".'
+                )
+            kwargs['type'] = streamed(kwargs.get('type') or str)
+
+        self.sweep = sweep
+
+        if sweep:
+            kwargs['type'] = swept(kwargs.get('type') or str)
+
+        choices = kwargs.get('choices')
+
+        if choices is not None and not isinstance(choices, Choices):
+            load_lazily = callable(choices) or isinstance(choices, PathLike)
+            if load_lazily or len(choices) > self.many_choices:
+                choices = kwargs['choices'] = Choices(choices)
+
+        if isinstance(choices, Choices):
+            kwargs.setdefault('metavar', choices.summary)
+
         self.kwargs = kwargs
         self.default = kwargs.get('default', None)
 
@@ -66,6 +197,48 @@ class Argument:
                 f'for an optional argument named "{name}".'
             )
 
+    def __set_name__(self, owner, name):
+        # name the argument when the class is created, so that binding
+        # (in each instance of the parser) does not need to modify it
+        if not self.name:
+            self.name = name
+
+    def __copy__(self):
+        copied = Argument.__new__(self.__class__)
+        for cls in self.__class__.__mro__:
+            for slot in cls.__dict__.get('__slots__', ()):
+                if hasattr(self, slot):
+                    setattr(copied, slot, getattr(self, slot))
+        if hasattr(self, '__dict__'):
+            copied.__dict__.update(self.__dict__)
+        copied.kwargs = dict(self.kwargs)
+        return copied
+
+    @property
+    def has_side_effects(self):
+        """Does parsing of this argument do more than producing a value?
+
+        True for custom actions (e.g. :func:`action` callbacks), files
+        opened during parsing, streamed, lazy and coroutine arguments.
+        """
+        action = self.kwargs.get('action')
+        converter = self.kwargs.get('type')
+        return bool(
+            (action is not None and not isinstance(action, str))
+            or isinstance(converter, (argparse.FileType, PrefetchedFileType))
+            or converter is mapped_file
+            or iscoroutinefunction(converter)
+            or self.stream or self.lazy
+        )
+
+    @property
+    def help(self):
+        return self.kwargs.get('help')
+
+    @help.setter
+    def help(self, text):
+        self.kwargs['help'] = text
+
     @property
     def args(self):
 
@@ -85,19 +258,184 @@ class Argument:
         if callable(myself):
             return True
         if partner and myself:
-            return len(partner) == len(myself)
+            return Argument.count(partner) == Argument.count(myself)
         return True
 
+    @staticmethod
+    def count(values):
+        return values.count if isinstance(values, Stream) else len(values)
+
+    def check_counts(self, myself, partner):
+        if not self.as_numerous_as(myself, partner):
+            raise ValueError(
+                f'{self.name} for {self.count(myself)} {self.as_many_as.name} '
+                f'provided, expected for {self.count(partner)}'
+            )
+
+    def defer_validation(self, myself, partner):
+        """Check counts of values once all involved streams are exhausted."""
+        streams = [
+            values
+            for values in [myself, partner]
+            if isinstance(values, Stream)
+        ]
+
+        def deferred_check(stream):
+            if all(stream.exhausted for stream in streams):
+                self.check_counts(myself, partner)
+
+        for stream in streams:
+            stream.defer(deferred_check)
+
     def validate(self, opts):
         myself = getattr(opts, self.name)
 
         if self.as_many_as:
             partner = getattr(opts, self.as_many_as.name)
-            if not self.as_numerous_as(myself, partner):
-                raise ValueError(
-                    f'{self.name} for {len(myself)} {self.as_many_as.name} '
-                    f'provided, expected for {len(partner)}'
+            if isinstance(myself, Stream) or isinstance(partner, Stream):
+                self.defer_validation(myself, partner)
+            else:
+                self.check_counts(myself, partner)
+
+
+def order_validators(arguments):
+    """Select arguments which need validation and order them by dependency.
+
+    Only arguments with `as_many_as` (or with overridden `validate`)
+    are selected; an argument is placed after the argument it depends on,
+    if that one needs validation too.
+
+    Raises:
+        ValueError: if `as_many_as` dependencies form a cycle
+    """
+    # arguments are matched by names, as they can be (copies) of the partners
+    selected = {
+        argument.name: argument
+        for argument in arguments
+        if argument.as_many_as or type(argument).validate is not Argument.validate
+    }
+    ordered = []
+    # names of arguments in the chain being visited, and of the already placed
+    visiting = []
+    placed = set()
+
+    def place(argument):
+        if argument.name in placed:
+            return
+        if argument.name in visiting:
+            chain = visiting[visiting.index(argument.name):]
+            raise ValueError(f'Cyclic as_many_as dependencies: {" -> ".join(chain + [argument.name])}')
+        visiting.append(argument.name)
+        partner = argument.as_many_as
+        if partner is not None and partner.name in selected:
+            place(selected[partner.name])
+        visiting.pop()
+        placed.add(argument.name)
+        ordered.append(argument)
+
+    for argument in selected.values():
+        place(argument)
+
+    return ordered
+
+
+class BuiltinParser(argparse.ArgumentParser):
+    """The argparse parser, reporting invalid values of :class:`Choices` briefly.
+
+    argparse lists all the allowed values in the error message,
+    which would be overwhelming for long collections of choices.
+    """
+
+    def _check_value(self, action, value):
+        if isinstance(action.choices, Choices):
+            if value not in action.choices:
+                raise argparse.ArgumentError(
+                    action, f'invalid choice: {value!r} (choose from {action.choices.summary})'
                 )
+            return
+        super()._check_value(action, value)
+
+
+@lru_cache(maxsize=None)
+def record_type(name, fields):
+    """Create a compact, slotted class for parsing results with given fields.
+
+    Instances support attribute access and :func:`vars`;
+    the classes are created once for each name and set of fields.
+    """
+
+    def __init__(self, **values):
+        for field, value in values.items():
+            setattr(self, field, value)
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in fields}
+
+    def __repr__(self):
+        values = ', '.join(f'{field}={value!r}' for field, value in as_dict(self).items())
+        return f'{name}({values})'
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return as_dict(self) == as_dict(other)
+
+    def __reduce__(self):
+        # the class is created dynamically, so it cannot be pickled by reference
+        return restore_record, (name, fields, tuple(as_dict(self).values()))
+
+    return type(name, (), {
+        '__slots__': fields,
+        '__init__': __init__,
+        '__dict__': property(as_dict),
+        '__repr__': __repr__,
+        '__eq__': __eq__,
+        '__reduce__': __reduce__,
+    })
+
+
+def restore_record(name, fields, values):
+    """Re-create a record of :func:`record_type` (used when unpickling)."""
+    return record_type(name, fields)(**dict(zip(fields, values)))
+
+
+def awaitable_slots(namespace):
+    """Find awaitable values in (nested) namespace, e.g. from coroutine converters.
+
+    Returns:
+        list of (container, key, name of argument) tuples
+    """
+    slots = []
+
+    def collect(namespace):
+        for name, value in vars(namespace).items():
+            if isinstance(value, argparse.Namespace):
+                collect(value)
+            elif isawaitable(value):
+                slots.append((namespace, name, name))
+            elif isinstance(value, list):
+                slots.extend(
+                    (value, i, name)
+                    for i, item in enumerate(value)
+                    if isawaitable(item)
+                )
+
+    collect(namespace)
+    return slots
+
+
+def compact(namespace, name='Record'):
+    """Convert (nested) :class:`argparse.Namespace` into compact records.
+
+    Namespaces with attributes not being valid identifiers are kept as-is.
+    """
+    values = {
+        key: compact(value, key) if isinstance(value, argparse.Namespace) else value
+        for key, value in vars(namespace).items()
+    }
+    if not all(key.isidentifier() for key in values):
+        return namespace
+    return record_type(name, tuple(values))(**values)
 
 
 def create_action(callback, exit_immediately=True):
@@ -217,7 +555,8 @@ class Parser:
         """
         self.namespace = argparse.Namespace()
         self.parser_name = parser_name
-        self.parser = argparse.ArgumentParser(
+        self._profile = Profile() if self.__profile__ else None
+        self.parser = BuiltinParser(
             formatter_class=argparse.RawDescriptionHelpFormatter
         )
 
@@ -231,17 +570,35 @@ class Parser:
         self.lifted_parsers = {}
         self.lifted_args = {}
 
+        # merged views and indices are (re)built lazily,
+        # when first used after binding
+        self._all_arguments = None
+        self._all_subparsers = None
+        self._option_index = None
+        self._subparser_index = None
+        self._validators = None
+
+        # incremented whenever the arguments or sub-parsers change
+        self._version = 0
+
+        # cache of parsing results, see __parse_cache_size__
+        self._parse_cache = OrderedDict()
+        self._parse_cache_lock = Lock()
+        self._parse_cache_hits = 0
+        self._parse_cache_misses = 0
+        self._purity = None
+
         attribute_handlers = {
             Argument: self.bind_argument,
             Parser: self.bind_parser,
         }
 
         # register class attributes
-        for name in dir(self):
-            attribute = getattr(self, name)
-            for attribute_type, handler in attribute_handlers.items():
-                if isinstance(attribute, attribute_type):
-                    handler(attribute, name)
+        with self._measure('bind'):
+            for name, attribute in self._declared_attributes():
+                for attribute_type, handler in attribute_handlers.items():
+                    if isinstance(attribute, attribute_type):
+                        handler(attribute, name)
 
         # initialize namespace
         for name, argument in self.all_arguments.items():
@@ -250,16 +607,124 @@ class Parser:
         for name, value in kwargs.items():
             setattr(self.namespace, name, value)
 
-        self.to_builtin_parser()
+        # initial state of namespace, restored by reset()
+        self._initial_values = dict(vars(self.namespace))
+
+        with self._measure('to_builtin_parser'):
+            self.to_builtin_parser()
         self.kwargs = kwargs
 
+    def _declared_attributes(self):
+        """Pairs of (name, attribute) to be checked for arguments and sub-parsers."""
+        for name in dir(self):
+            yield name, getattr(self, name)
+
     @property
     def all_subparsers(self):
-        return {**self.subparsers, **self.lifted_parsers}
+        """Read-only view of own and lifted sub-parsers.
+
+        The view is merged once after binding (not on every access).
+        """
+        if self._all_subparsers is None:
+            self._all_subparsers = MappingProxyType({**self.subparsers, **self.lifted_parsers})
+        return self._all_subparsers
 
     @property
     def all_arguments(self):
-        return {**self.arguments, **self.lifted_args}
+        """Read-only view of own and lifted arguments.
+
+        The view is merged once after binding (not on every access).
+        """
+        if self._all_arguments is None:
+            self._all_arguments = MappingProxyType({**self.arguments, **self.lifted_args})
+        return self._all_arguments
+
+    @property
+    def _ordered_validators(self):
+        """Arguments which need validation, ordered by dependency.
+
+        Compiled once after binding, see :func:`order_validators`.
+        """
+        if self._validators is None:
+            self._validators = order_validators(self.all_arguments.values())
+        return self._validators
+
+    @property
+    def _needs_validation(self):
+        return bool(self._ordered_validators) or self._validate_overridden
+
+    @property
+    def _validate_overridden(self):
+        return type(self).validate is not Parser.validate
+
+    @property
+    def _option_prefixes(self):
+        """:class:`PrefixIndex` of long options accepted on this level.
+
+        Includes options of the argparse parser itself (i.e. --help),
+        so that the abbreviations are ambiguous when argparse says so.
+        """
+        if self._option_index is None:
+            options = {
+                option
+                for argument in self.all_arguments.values()
+                if argument.optional
+                for option in argument.args
+            }
+            options.update(self.parser._option_string_actions)
+            self._option_index = PrefixIndex(
+                option
+                for option in options
+                if option.startswith('--')
+            )
+        return self._option_index
+
+    @property
+    def _subparser_prefixes(self):
+        """:class:`PrefixIndex` of names of sub-parsers accepted on this level."""
+        if self._subparser_index is None:
+            self._subparser_index = PrefixIndex(self.all_subparsers)
+        return self._subparser_index
+
+    def _expand_abbreviations(self, args):
+        """Replace unambiguous abbreviations of long options with full names.
+
+        The abbreviations are resolved with :attr:`_option_prefixes`, so argparse
+        will find the options directly (without scanning all options).
+        """
+        expanded = []
+        for i, arg in enumerate(args):
+            if arg == '--':
+                expanded.extend(args[i:])
+                break
+            if arg.startswith('--') and arg != '--help':
+                option, separator, value = arg.partition('=')
+                if option not in self._option_prefixes:
+                    matches = self._resolve_abbreviation(option, self._option_prefixes, 'option')
+                    if matches:
+                        arg = matches[0] + separator + value
+            expanded.append(arg)
+        return expanded
+
+    def _expand_subparsers_abbreviations(self, args):
+        """Replace unambiguous prefixes of sub-parsers names with full names."""
+        expanded = []
+        for i, arg in enumerate(args):
+            if arg == '--':
+                expanded.extend(args[i:])
+                break
+            if not arg.startswith('-') and arg not in self._subparser_prefixes:
+                matches = self._resolve_abbreviation(arg, self._subparser_prefixes, 'sub-parser')
+                if matches:
+                    arg = matches[0]
+            expanded.append(arg)
+        return expanded
+
+    def _resolve_abbreviation(self, name, index, kind):
+        matches = index.matching(name)
+        if len(matches) > 1:
+            self.error(f'ambiguous {kind}: {name} could match {", ".join(matches)}')
+        return matches
 
     def to_builtin_parser(self):
         for argument in self.all_arguments.values():
@@ -270,7 +735,13 @@ class Parser:
         if not parser:
             parser = self.parser
 
-        parser.add_argument(*argument.args, **argument.kwargs)
+        kwargs = argument.kwargs
+
+        # converters of sub-parsers copied while profiling are measured too
+        if (self._profile or active_profile.get()) and kwargs.get('type'):
+            kwargs = {**kwargs, 'type': timed(kwargs['type'], f'{self._node_name}:convert {argument.name}')}
+
+        parser.add_argument(*argument.args, **kwargs)
 
     def attach_subparsers(self):
         """Only in order to show a nice help, really.
@@ -317,11 +788,14 @@ class Parser:
         # Copy is needed as we do not want to share values of parsers'
         # arguments across separate instances of parsers (which is the
         # default behaviour when using class-properties).
-        parser = deepcopy(parser)
+        with self._measure('deepcopy'):
+            parser = deepcopy(parser)
 
         # For easier access, and to make sure that we will not access
-        # the "raw" (not deep-copied) instance of parser again.
-        setattr(self, name, parser)
+        # the "raw" (not deep-copied) instance of parser again
+        # (unless the name is taken by a property of the parser).
+        if not isinstance(getattr(type(self), name, None), property):
+            setattr(self, name, parser)
 
         parser.parser_name = name
         self.subparsers[name] = parser
@@ -330,24 +804,60 @@ class Parser:
             self.lifted_args.update(parser.arguments)
             self.lifted_parsers.update(parser.subparsers)
 
+        self._all_arguments = None
+        self._all_subparsers = None
+        self._option_index = None
+        self._subparser_index = None
+        self._validators = None
+        self._version += 1
+
     def bind_argument(self, argument: Argument, name=None):
         """Bind argument to current instance of Parser."""
+        # arguments defined in classes are named on class creation;
+        # only the ones passed explicitly may need a name here
         if not argument.name and name:
             argument.name = name
         self.arguments[name] = argument
+        self._all_arguments = None
+        self._option_index = None
+        self._validators = None
+        self._version += 1
 
     def parse_single_level(self, ungrouped_args):
         if self.__pull_to_namespace_above__ and self.__skip_if_absent__ and not ungrouped_args:
             # do not run validate/produce and parsing if there is nothing to parse (part B)
             return self.namespace, ungrouped_args
 
-        namespace, unknown_args = self.parser.parse_known_args(
-            ungrouped_args,
-            namespace=self.namespace
-        )
+        with self._measure('argparse'):
+            namespace, unknown_args = self.parser.parse_known_args(
+                self._expand_abbreviations(ungrouped_args),
+                namespace=self.namespace
+            )
+        productions = deferred_productions.get()
+
+        if productions is not None and self in productions:
+            if self._needs_validation:
+                with self._measure('validate'):
+                    self._run_checked(self.validate, self.namespace)
+            # to be run by the parent parser, see _run_productions()
+            productions[self] = partial(self._run_checked, self._measured_produce, unknown_args)
+            return namespace, unknown_args
+
+        if self._needs_validation:
+            with self._measure('validate'):
+                self._run_checked(self.validate, self.namespace)
+        opts = self._run_checked(self._measured_produce, unknown_args)
+
+        assert opts is namespace
+
+        return opts, unknown_args
+
+    def _run_checked(self, step, *args):
+        """Run parsing step, showing usage and error message on failure."""
         try:
-            self.validate(self.namespace)
-            opts = self.produce(unknown_args)
+            return step(*args)
+        except AsyncParsingRequired:
+            raise
         except (ValueError, TypeError, argparse.ArgumentTypeError) as e:
             if self.__error_verbosity__ > 0:
                 print_exc()
@@ -355,9 +865,57 @@ class Parser:
             self.error(e.args[0])
             raise e
 
-        assert opts is namespace
+    def _produce_namespace(self, unknown_args):
+        opts = self.produce(unknown_args)
+        if isawaitable(opts):
+            self._defer_production(opts)
+            opts = self.namespace
+        return opts
 
-        return opts, unknown_args
+    def _measured_produce(self, unknown_args):
+        with self._measure('produce'):
+            return self._produce_namespace(unknown_args)
+
+    def _run_productions(self, productions):
+        """Run deferred `produce` of sub-parsers in a pool of threads.
+
+        Sub-parsers declaring dependencies (with `__produce_after__`)
+        will only be produced when their dependencies are done.
+        """
+        productions = {
+            parser.parser_name: production
+            for parser, production in productions.items()
+            if production
+        }
+        dependencies = {
+            name: set(self.subparsers[name].__produce_after__) & set(productions)
+            for name in productions
+        }
+        done = set()
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.__produce_workers__) as executor:
+
+            def submit_ready():
+                for name, required in dependencies.items():
+                    if name not in done and name not in running and required <= done:
+                        context = copy_context()
+                        running[name] = executor.submit(context.run, productions[name])
+
+            submit_ready()
+
+            while running:
+                finished, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                for name, future in list(running.items()):
+                    if future in finished:
+                        future.result()
+                        done.add(name)
+                        del running[name]
+                submit_ready()
+
+        if len(done) != len(productions):
+            cycle = ', '.join(sorted(set(productions) - done))
+            raise ValueError(f'Cyclic dependencies of produce() in: {cycle}')
 
     def parse_known_args(self, args: Sequence[str]):
         """Parse known arguments, like :meth:`argparse.ArgumentParser.parse_known_args`.
@@ -367,36 +925,67 @@ class Parser:
             - validation with `self.validate` (run after parsing)
             - additional post-processing with `self.produce` (after validation)
         """
-        grouped_args, ungrouped_args = group_arguments(args, self.all_subparsers)
+        if self.__abbreviate_subparsers__:
+            args = self._expand_subparsers_abbreviations(args)
+
+        with self._measure('group_arguments'):
+            grouped_args, ungrouped_args = group_arguments(args, self._subparser_prefixes)
 
         if self.__parsing_order__ == 'breadth-first':
             opts, unknown_args = self.parse_single_level(ungrouped_args)
 
-        for name, parser in self.subparsers.items():
+        concurrent = bool(self.__produce_workers__)
 
-            if parser.__pull_to_namespace_above__:
+        if concurrent:
+            # produce() of (not translucent) sub-parsers will be deferred
+            productions = {
+                parser: None
+                for parser in self.subparsers.values()
+                if not parser.__pull_to_namespace_above__
+            }
+            token = deferred_productions.set(productions)
 
-                namespace, not_parsed_args = parser.parse_known_args([
-                    arg_str
-                    for key in parser.subparsers
-                    for arg_str in [key, *grouped_args[key]]
-                    # only include the sub-parser if it was explicitly enlisted
-                    if key in grouped_args
-                ])
+        not_parsed = {}
 
-                for key, value in vars(namespace).items():
-                    setattr(self.namespace, key, value)
-            else:
-                if parser.__skip_if_absent__ and name not in grouped_args:
-                    # do not run validate/produce and parsing if there is nothing to parse (part A)
-                    setattr(self.namespace, name, None)
-                    not_parsed_args = None
-                else:
-                    namespace, not_parsed_args = parser.parse_known_args(grouped_args[name])
-                    setattr(self.namespace, name, namespace)
+        try:
+            for name, parser in self.subparsers.items():
 
-            if not_parsed_args:
-                parser.error(f'unrecognized arguments: {" ".join(not_parsed_args)}')
+                if parser.__pull_to_namespace_above__:
+
+                    namespace, not_parsed_args = parser.parse_known_args([
+                        arg_str
+                        for key in parser.subparsers
+                        for arg_str in [key, *grouped_args[key]]
+                        # only include the sub-parser if it was explicitly enlisted
+                        if key in grouped_args
+                    ])
+
+                    for key, value in vars(namespace).items():
+                        setattr(self.namespace, key, value)
+                else:
+                    if parser.__skip_if_absent__ and name not in grouped_args:
+                        # do not run validate/produce and parsing if there is nothing to parse (part A)
+                        setattr(self.namespace, name, None)
+                        not_parsed_args = None
+                    else:
+                        namespace, not_parsed_args = parser.parse_known_args(grouped_args[name])
+                        setattr(self.namespace, name, namespace)
+
+                # produce() may still consume some of the arguments if deferred
+                if concurrent:
+                    not_parsed[parser] = not_parsed_args
+                elif not_parsed_args:
+                    parser.error(f'unrecognized arguments: {" ".join(not_parsed_args)}')
+        finally:
+            if concurrent:
+                deferred_productions.reset(token)
+
+        if concurrent:
+            self._run_productions(productions)
+
+            for parser, not_parsed_args in not_parsed.items():
+                if not_parsed_args:
+                    parser.error(f'unrecognized arguments: {" ".join(not_parsed_args)}')
 
         if self.__parsing_order__ == 'depth-first':
             opts, unknown_args = self.parse_single_level(ungrouped_args)
@@ -412,7 +1001,7 @@ class Parser:
         """
         if not opts:
             opts = self.namespace
-        for argument in self.all_arguments.values():
+        for argument in self._ordered_validators:
             argument.validate(opts)
 
     @property
@@ -444,6 +1033,67 @@ class Parser:
         """Only invoke sub-parser parsing if it was explicitly enlisted"""
         return True
 
+    @property
+    def __compact_namespace__(self):
+        """Should :meth:`parse_args` return compact records?
+
+        If True, the parsed namespace (including namespaces of sub-parsers)
+        is converted to instances of slotted classes (see :func:`compact`),
+        which use a fraction of memory of :class:`argparse.Namespace`.
+        """
+        return False
+
+    @property
+    def __parse_cache_size__(self):
+        """How many results of :meth:`parse_args` should be cached?
+
+        By default (None) the results are not cached. Otherwise, parsing
+        the same arguments again returns a copy of the cached result,
+        without re-running parsing, validation or production. The cache
+        is disabled automatically if any of the arguments has side
+        effects (see :attr:`Argument.has_side_effects`), and invalidated
+        by changes of arguments or sub-parsers in the tree.
+        """
+        return None
+
+    @property
+    def __produce_workers__(self):
+        """How many threads should be used to run `produce` of sub-parsers?
+
+        By default (None) sub-parsers are produced one after another,
+        in order. Otherwise, `produce` of sub-parsers (except for
+        translucent ones) will be run concurrently, after all the
+        sub-parsers were parsed, respecting `__produce_after__`
+        dependencies.
+        """
+        return None
+
+    @property
+    def __produce_after__(self):
+        """Names of sibling sub-parsers which have to be produced before this one.
+
+        Only used when the parent parser has `__produce_workers__` set.
+        """
+        return []
+
+    @property
+    def __abbreviate_subparsers__(self):
+        """Should unambiguous prefixes of sub-parsers names be accepted?
+
+        Disabled by default, as a positional value could be mistaken
+        for an abbreviated name of a sub-parser.
+        """
+        return False
+
+    @property
+    def __profile__(self):
+        """Should the time spent in parsing phases be measured?
+
+        By default, enabled with a non-empty DECLARATIVE_PARSER_PROFILE
+        environment variable (other than "0"). See :meth:`stats`.
+        """
+        return profiling_enabled()
+
     @property
     def __parsing_order__(self):
         """What should be parsed first:
@@ -470,11 +1120,47 @@ class Parser:
         rebind the name with `unknown_args = []`, as doing so
         will have no effect: use `unknown_args.remove()` instead).
         """
+        # other sub-parsers were already produced when parsing
+        # their arguments, but translucent ones share the namespace
+        # (and the arguments) with this parser, so are produced here
         for subparser in self.subparsers.values():
+            if not subparser.__pull_to_namespace_above__:
+                continue
             subparser.namespace = self.namespace
-            unknown_args = subparser.produce(unknown_args)
+            produced = subparser.produce(unknown_args)
+            if isawaitable(produced):
+                self._defer_production(produced)
         return self.namespace
 
+    @staticmethod
+    def _defer_production(production):
+        """Schedule a coroutine returned by `produce` to be awaited by :meth:`parse_args_async`."""
+        productions = pending_productions.get()
+        if productions is None:
+            production.close()
+            raise AsyncParsingRequired('Parsers with coroutine produce() require parse_args_async()')
+        productions.append(production)
+
+    @staticmethod
+    def sweep(namespace):
+        """Expand namespace with swept arguments into namespaces for all combinations.
+
+        The combinations (cartesian product of swept values) are generated
+        lazily, one namespace at a time.
+        """
+        swept_names = [
+            name
+            for name, value in vars(namespace).items()
+            if isinstance(value, Sweep)
+        ]
+        swept_values = [getattr(namespace, name) for name in swept_names]
+
+        for point in product(*swept_values):
+            expanded = argparse.Namespace(**vars(namespace))
+            for name, value in zip(swept_names, point):
+                setattr(expanded, name, value)
+            yield expanded
+
     def error(self, message):
         """Raises SystemExit with status code 2 and shows usage message."""
         self.attach_subparsers()
@@ -492,6 +1178,133 @@ class Parser:
         Args:
             args: strings to parse, default is sys.argv[1:]
         """
+        with self._measure('parse_args'):
+            if self.__parse_cache_size__ and self._cacheable:
+                options = self._parse_cached(args)
+            else:
+                options = self._parse_all_args(args)
+
+        slots = awaitable_slots(options)
+        if slots:
+            for container, key, name in slots:
+                value = getattr(container, key) if isinstance(container, argparse.Namespace) else container[key]
+                if hasattr(value, 'close'):
+                    value.close()
+            raise AsyncParsingRequired('Arguments with coroutine converters require parse_args_async()')
+
+        if self.__compact_namespace__:
+            return compact(options, self.__class__.__name__)
+
+        return options
+
+    @property
+    def _tree_version(self):
+        """Versions of this parser and of all its sub-parsers."""
+        return (self._version, *(
+            subparser._tree_version
+            for subparser in self.subparsers.values()
+        ))
+
+    @property
+    def _cacheable(self):
+        """Can the results of parsing be cached (no arguments with side effects)?"""
+        version = self._tree_version
+        if not self._purity or self._purity[0] != version:
+            self._purity = version, self._is_pure()
+        return self._purity[1]
+
+    def _is_pure(self):
+        return not any(
+            argument.has_side_effects
+            for argument in self.all_arguments.values()
+        ) and all(
+            subparser._is_pure()
+            for subparser in self.subparsers.values()
+        )
+
+    def _parse_cached(self, args: Sequence[str] = None):
+        """Parse arguments, reusing a copy of the result if given arguments were parsed before.
+
+        The parser is reset before parsing (so results depend only
+        on the arguments). See :attr:`__parse_cache_size__`.
+        """
+        args = args if args is not None else sys.argv[1:]
+        key = (tuple(args), self._tree_version)
+
+        with self._parse_cache_lock:
+            if key in self._parse_cache:
+                self._parse_cache.move_to_end(key)
+                self._parse_cache_hits += 1
+                return deepcopy(self._parse_cache[key])
+            self._parse_cache_misses += 1
+
+        self._reset()
+        options = self._parse_all_args(args)
+
+        try:
+            stored = deepcopy(options)
+        except TypeError:
+            # some values cannot be copied; do not cache these
+            return options
+
+        with self._parse_cache_lock:
+            self._parse_cache[key] = stored
+            while len(self._parse_cache) > self.__parse_cache_size__:
+                self._parse_cache.popitem(last=False)
+
+        return options
+
+    @property
+    def _node_name(self):
+        return self.parser_name or self.__class__.__name__
+
+    def _measure(self, phase):
+        """Context manager measuring given phase, if profiling is enabled."""
+        profile = active_profile.get() or self._profile
+        if profile is None:
+            return nullcontext()
+        return profile.measure(f'{self._node_name}:{phase}')
+
+    def stats(self):
+        """Times of construction and parsing phases (see :class:`~.profiling.Profile`).
+
+        Requires profiling to be enabled (see `__profile__`); measurements
+        of sub-parsers are included in the profile of the parser which
+        started the parsing.
+
+        Example::
+
+            stats = parser.stats()
+            calls, wall, cpu = stats.by_phase()['produce']
+            stats.write_collapsed('parser.folded')
+        """
+        if self._profile is None:
+            raise RuntimeError(
+                'Profiling is disabled: set __profile__ = True '
+                'or DECLARATIVE_PARSER_PROFILE=1 environment variable.'
+            )
+        return self._profile
+
+    def memory_report(self):
+        """Retained size of each node of the tree (see :class:`~.memory.MemoryReport`).
+
+        Example::
+
+            report = parser.memory_report()
+            print(report)
+            assert report.total < 50 * 2 ** 20
+        """
+        return memory_report(self)
+
+    def parse_cache_info(self):
+        """Statistics of the parsing results cache (like :func:`functools.lru_cache`)."""
+        return CacheInfo(
+            self._parse_cache_hits, self._parse_cache_misses,
+            self.__parse_cache_size__, len(self._parse_cache)
+        )
+
+    def _parse_all_args(self, args: Sequence[str] = None):
+        """Parse all arguments (see :meth:`parse_args`), without post-processing."""
         args = args if args is not None else sys.argv[1:]
 
         # Use the built-in help (just attach sub-parsers before).
@@ -508,5 +1321,117 @@ class Parser:
 
         return options
 
-    def __deepcopy__(self, memodict={}):
+    async def parse_args_async(self, args: Sequence[str] = None):
+        """Same as :meth:`parse_args`, but supports coroutine converters and produce.
+
+        Arguments with coroutine function as `type` are converted
+        concurrently (with :func:`asyncio.gather`) after parsing and
+        validation; coroutines returned by `produce` are awaited later,
+        one by one, in the order in which they were created.
+        Synchronous converters and `produce` methods work as usual.
+        """
+        productions = []
+        token = pending_productions.set(productions)
+        try:
+            with self._measure('parse_args'):
+                options = self._parse_all_args(args)
+            await self._resolve_awaitables(options)
+        except BaseException:
+            # do not leave the coroutines which will never be awaited
+            for production in productions:
+                production.close()
+            raise
+        finally:
+            pending_productions.reset(token)
+
+        for production in productions:
+            await production
+
+        if self.__compact_namespace__:
+            return compact(options, self.__class__.__name__)
+
+        return options
+
+    async def _resolve_awaitables(self, namespace):
+        """Await all awaitable values in (nested) namespace, replacing them with results."""
+        slots = awaitable_slots(namespace)
+
+        results = await asyncio.gather(
+            *(
+                getattr(container, key) if isinstance(container, argparse.Namespace) else container[key]
+                for container, key, name in slots
+            ),
+            return_exceptions=True
+        )
+
+        for (container, key, name), result in zip(slots, results):
+            if isinstance(result, (ValueError, TypeError, argparse.ArgumentTypeError)):
+                self.error(f'argument {name}: {result}')
+            if isinstance(result, BaseException):
+                raise result
+
+        for (container, key, name), result in zip(slots, results):
+            if isinstance(container, argparse.Namespace):
+                setattr(container, key, result)
+            else:
+                container[key] = result
+
+    def reset(self):
+        """Restore namespaces of this parser and its sub-parsers to the initial state.
+
+        Use it to parse another list of arguments with the same parser,
+        without values left from the previous parsing.
+        """
+        self._reset()
+
+    def _reset(self):
+        self.namespace = argparse.Namespace(**self._initial_values)
+        for subparser in self.subparsers.values():
+            subparser._reset()
+
+    def execute(self, args):
+        """Process a single list of arguments in :meth:`map`."""
+        return self.parse_args(args)
+
+    def session(self, args: Sequence[str] = ()):
+        """Start an incremental parsing session (see :class:`~.session.Session`).
+
+        The `args` are parsed in full once; afterwards, single arguments
+        can be changed with :meth:`Session.set <.session.Session.set>`,
+        which only re-does the work affected by the change.
+        """
+        return Session(self, args)
+
+    def map(
+            self, argv_iterable, workers=None, backend='process',
+            chunk_size=1, max_in_flight=None, ordered=True
+    ):
+        """Parse (and :meth:`execute`) many lists of arguments in a pool of workers.
+
+        Only the lists of arguments (and results) are sent to the workers,
+        which keep own, warm copies of the parser; to start a worker, the
+        parser is pickled as a recipe (class and keyword arguments), so
+        the classes have to be defined at module level for the process
+        backend.
+
+        Args:
+            argv_iterable: lists of arguments; consumed lazily
+            workers: number of workers; defaults to the number of CPUs
+            backend: either 'process' or 'thread'
+            chunk_size: how many lists of arguments to send at once
+            max_in_flight: how many chunks can be pending at once
+            ordered: if False, results will be yielded as completed
+        """
+        results = bounded_map(
+            execute_chunk, chunked(argv_iterable, chunk_size),
+            workers=workers, backend=backend, max_in_flight=max_in_flight,
+            ordered=ordered, initializer=initialize_worker, initargs=(self,)
+        )
+        for chunk in results:
+            yield from chunk
+
+    def __reduce__(self):
+        return partial(self.__class__, **self.kwargs), ()
+
+    def __deepcopy__(self, memodict=None):
         return self.__class__(**self.kwargs)
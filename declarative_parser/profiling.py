@@ -0,0 +1,115 @@
+import os
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from time import perf_counter, thread_time
+
+
+# the profile which collects measurements in the current context
+active_profile = ContextVar('active_profile', default=None)
+
+# frames of the measurements in progress, e.g. ('Program:parse_args', 'Program:argparse')
+current_stack = ContextVar('current_stack', default=())
+
+
+def profiling_enabled():
+    """Is profiling requested with DECLARATIVE_PARSER_PROFILE environment variable?"""
+    return os.environ.get('DECLARATIVE_PARSER_PROFILE', '') not in {'', '0'}
+
+
+class Profile:
+    """Wall and CPU time of parsing phases, collected per stack of frames.
+
+    Frames are named "node:phase", where node is the name of a (sub-)parser
+    and phase one of: bind, deepcopy, to_builtin_parser, parse_args,
+    group_arguments, argparse, validate, produce or "convert <argument>".
+    Times are inclusive (include the nested frames) in :attr:`records`,
+    and exclusive in the summaries (:meth:`by_phase`, :meth:`by_node`).
+    """
+
+    def __init__(self):
+        # stack of frames -> [calls, wall time, cpu time]
+        self.records = defaultdict(lambda: [0, 0.0, 0.0])
+        self.lock = Lock()
+
+    @contextmanager
+    def measure(self, frame):
+        stack = current_stack.get() + (frame,)
+        stack_token = current_stack.set(stack)
+        profile_token = active_profile.set(self)
+        wall, cpu = perf_counter(), thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = perf_counter() - wall, thread_time() - cpu
+            active_profile.reset(profile_token)
+            current_stack.reset(stack_token)
+            with self.lock:
+                record = self.records[stack]
+                record[0] += 1
+                record[1] += wall
+                record[2] += cpu
+
+    def exclusive(self):
+        """Calls, wall and cpu time of each stack, excluding the nested frames."""
+        with self.lock:
+            records = {stack: list(record) for stack, record in self.records.items()}
+
+        exclusive = {stack: list(record) for stack, record in records.items()}
+
+        for stack, (calls, wall, cpu) in records.items():
+            parent = exclusive.get(stack[:-1])
+            if parent:
+                parent[1] -= wall
+                parent[2] -= cpu
+
+        return exclusive
+
+    def summarize(self, key):
+        summary = defaultdict(lambda: [0, 0.0, 0.0])
+        for stack, (calls, wall, cpu) in self.exclusive().items():
+            entry = summary[key(stack[-1])]
+            entry[0] += calls
+            entry[1] += wall
+            entry[2] += cpu
+        return {name: tuple(entry) for name, entry in summary.items()}
+
+    def by_phase(self):
+        """(calls, wall time, cpu time) for each phase, summed over nodes."""
+        return self.summarize(lambda frame: frame.partition(':')[2])
+
+    def by_node(self):
+        """(calls, wall time, cpu time) for each node, summed over phases."""
+        return self.summarize(lambda frame: frame.partition(':')[0])
+
+    def collapsed(self):
+        """Lines in the collapsed-stack format (exclusive wall time in microseconds)."""
+        return [
+            f'{";".join(stack)} {round(wall * 1e6)}'
+            for stack, (calls, wall, cpu) in sorted(self.exclusive().items())
+        ]
+
+    def write_collapsed(self, path):
+        """Save the measurements for flamegraph.pl (or compatible tools)."""
+        with open(path, 'w') as file:
+            file.writelines(line + '\n' for line in self.collapsed())
+
+    def clear(self):
+        with self.lock:
+            self.records.clear()
+
+
+def timed(converter, frame):
+    """Wrap a converter, so its calls are measured when profiling is active."""
+
+    def timed_converter(value):
+        profile = active_profile.get()
+        if profile is None:
+            return converter(value)
+        with profile.measure(frame):
+            return converter(value)
+
+    # argparse uses the name in error messages
+    timed_converter.__name__ = getattr(converter, '__name__', repr(converter))
+    return timed_converter
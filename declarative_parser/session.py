@@ -0,0 +1,133 @@
+from collections import defaultdict
+
+
+class Session:
+    """Incremental parsing session, for interactive use.
+
+    Created with :meth:`~.parser.Parser.session`. The arguments are
+    parsed once, in full; then :meth:`set` re-converts only the changed
+    argument, re-validates it together with arguments which depend on
+    it (via `as_many_as`), calls custom `validate` methods of the parser
+    owning the argument and of its ancestors, and re-runs `produce` only
+    in these parsers (not in the siblings).
+
+    Example::
+
+        session = parser.session(['output', '--format', 'gif'])
+        session.set('--scale', '50')
+        assert session.namespace.output.scale == 50
+    """
+
+    def __init__(self, parser, args=()):
+        self.parser = parser
+        parser._reset()
+        self.namespace = parser._parse_all_args(list(args))
+
+        # option strings (and positional names) -> paths of owning parsers
+        self.owners = defaultdict(list)
+        # arguments which are validated against given argument (per parser)
+        self.dependents = {}
+
+        self.index(parser, ())
+
+    def index(self, parser, path):
+        dependents = defaultdict(list)
+
+        for argument in parser.all_arguments.values():
+            for option in argument.args:
+                self.owners[option].append(path)
+
+        for argument in parser._ordered_validators:
+            if argument.as_many_as:
+                dependents[argument.as_many_as.name].append(argument)
+
+        self.dependents[path] = dependents
+
+        for name, subparser in parser.subparsers.items():
+            # arguments of translucent parsers are owned by their parent
+            if not subparser.__pull_to_namespace_above__:
+                self.index(subparser, (*path, name))
+
+    def find_owner(self, option, path=None):
+        paths = self.owners.get(option, [])
+        if path is not None:
+            path = tuple(path)
+            if path not in paths:
+                raise ValueError(f'{option} is not accepted by {" ".join(path) or "the main parser"}')
+            return path
+        if not paths:
+            raise ValueError(f'Unknown argument: {option}')
+        if len(paths) > 1:
+            candidates = ', '.join(' '.join(path) or '(main parser)' for path in paths)
+            raise ValueError(f'{option} is ambiguous, specify path: one of {candidates}')
+        return paths[0]
+
+    def chain(self, path):
+        """Parsers and their namespaces on the path, starting from the main parser."""
+        parser = self.parser
+        namespace = self.namespace
+        chain = [(parser, namespace)]
+
+        for name in path:
+            subparser = parser.subparsers[name]
+            sub_namespace = getattr(namespace, name, None)
+            if sub_namespace is None:
+                # the sub-parser was not enlisted so far
+                subparser._reset()
+                sub_namespace = subparser.namespace
+                setattr(namespace, name, sub_namespace)
+            parser, namespace = subparser, sub_namespace
+            chain.append((parser, namespace))
+
+        return chain
+
+    def set(self, option, *values, path=None):
+        """Set value of a single argument, updating only what depends on it.
+
+        Args:
+            option: option string (e.g. '--scale') or name of a positional argument
+            values: strings, as would be given in the command line
+            path: names of sub-parsers leading to the owner of the argument;
+                only required if the option is accepted by many parsers
+
+        Raises:
+            argparse.ArgumentError: if a value could not be converted
+            ValueError: if validation failed
+        """
+        path = self.find_owner(option, path)
+        chain = self.chain(path)
+        parser, namespace = chain[-1]
+
+        action = self.find_action(parser, option)
+        value = parser.parser._get_values(action, list(values))
+        action(parser.parser, namespace, value, option if action.option_strings else None)
+
+        argument = next(
+            argument
+            for argument in parser.all_arguments.values()
+            if option in argument.args
+        )
+        to_validate = [argument] if argument.as_many_as else []
+        to_validate.extend(self.dependents[path][argument.name])
+
+        for dependent in to_validate:
+            dependent.validate(namespace)
+
+        # custom validation may involve any of the arguments
+        for parser, namespace in reversed(chain):
+            if parser._validate_overridden:
+                parser.validate(namespace)
+
+        # the products of the owner and of its ancestors may be affected
+        for parser, namespace in reversed(chain):
+            parser.namespace = namespace
+            parser.produce([])
+
+        return self.namespace
+
+    @staticmethod
+    def find_action(parser, option):
+        for action in parser.parser._actions:
+            if option in action.option_strings or (not action.option_strings and action.dest == option):
+                return action
+        raise ValueError(f'Unknown argument: {option}')
@@ -1,5 +1,12 @@
+import mmap
+import os
+import re
+import sys
 from abc import ABC, abstractmethod
 from argparse import ArgumentTypeError
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from threading import Lock
 from typing import Iterable, Any
 
 
@@ -89,24 +96,56 @@ def dsv(value_type, delimiter=','):
     return closure
 
 
+def _as_predicate(guard):
+    """Turn a regular expression guard into a predicate; pass predicates through."""
+    if isinstance(guard, str):
+        guard = re.compile(guard)
+    if hasattr(guard, 'fullmatch'):
+        return guard.fullmatch
+    return guard
+
+
 def one_of(*types):
     """Create a function which attempts to cast input to any of provided types.
 
     The order of provided `types` is meaningful - if two types accept given
     input value, the first one on list will be used. Types should be able
     to accept a string (if correct) as input value for their constructors.
+
+    Any of the `types` can be given as a `(type, guard)` pair, where guard
+    is a cheap predicate or a regular expression (a string or a compiled
+    pattern) which the whole input has to match. Constructors of the types
+    with a guard rejecting the input are not called at all, which avoids
+    the cost of raising (and catching) an exception for each mismatch.
+
+    Example::
+
+        one_of((int, r'-?[0-9]+'), (float, lambda string: '.' in string), str)
     """
+    candidates = []
+    for candidate in types:
+        guard = None
+        if isinstance(candidate, tuple):
+            candidate, guard = candidate
+        candidates.append((candidate, _as_predicate(guard)))
 
     def one_of_types(string):
-        exceptions = []
-        for type_constructor in types:
+        failures = []
+        for type_constructor, guard in candidates:
+            if guard and not guard(string):
+                failures.append((type_constructor, None))
+                continue
             try:
                 return type_constructor(string)
             except (ArgumentTypeError, TypeError, ValueError) as e:
-                exceptions.append(f'{type_constructor.__name__}: {e}')
+                failures.append((type_constructor, e))
 
-        names = ', '.join(t.__name__ for t in types)
-        exceptions = ''.join('\n\t' + e for e in exceptions)
+        # the report is only needed (and built) when all types failed
+        names = ', '.join(t.__name__ for t, guard in candidates)
+        exceptions = ''.join(
+            f'\n\t{t.__name__}: {"rejected by guard" if e is None else e}'
+            for t, e in failures
+        )
 
         raise ArgumentTypeError(
             f'Argument {string} does not match any of allowed types: {names}.\n' +
@@ -116,6 +155,400 @@ def one_of(*types):
     return one_of_types
 
 
+def cached(converter, maxsize=128):
+    """Memoize conversions of given type converter, evicting least recently used.
+
+    Use for expensive converters (resolving paths, compiling regular
+    expressions, loading schemas) when the same values are converted
+    repeatedly. Works with plain callables as well as with the types
+    based on :class:`StringHandlingMixin` (the converted instances will
+    then be shared between the calls, so they should not be mutated).
+
+    Do not use with converters which have side effects on each call,
+    like :class:`argparse.FileType`.
+
+    The returned wrapper is safe to use from multiple threads and keeps
+    the name of the converter (so argparse error messages do not change);
+    hits and misses are reported by its `cache_info()` method.
+
+    Args:
+        converter: a callable accepting a single, hashable argument
+        maxsize: how many conversions to keep; None for no limit
+    """
+    return lru_cache(maxsize=maxsize)(converter)
+
+
+class Lazy:
+    """Value of an argument which will be converted on the first access.
+
+    Access the converted value with `value` property; other attributes
+    are looked up on the converted value directly, so (for example)
+    `lazy_file.read()` will open the file and then read from it.
+    Comparisons, hashing, `len()`, iteration, indexing, membership
+    tests, `str()` and truth tests are forwarded to the converted value
+    too. Anything else (like `isinstance` checks, arithmetic or passing
+    the value to functions expecting the exact type) requires `value`.
+    """
+
+    def __init__(self, converter, string):
+        self._converter = converter
+        self._string = string
+        self._value = None
+        self._lock = Lock()
+
+    @property
+    def value(self):
+        if self._converter:
+            with self._lock:
+                if self._converter:
+                    self._value = self._converter(self._string)
+                    self._converter = None
+        return self._value
+
+    def __getattr__(self, name):
+        # private names are not delegated (avoids recursion in copy/pickle)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.value, name)
+
+    @staticmethod
+    def resolve(value):
+        return value.value if isinstance(value, Lazy) else value
+
+    def __eq__(self, other):
+        return self.value == self.resolve(other)
+
+    def __ne__(self, other):
+        return self.value != self.resolve(other)
+
+    def __lt__(self, other):
+        return self.value < self.resolve(other)
+
+    def __le__(self, other):
+        return self.value <= self.resolve(other)
+
+    def __gt__(self, other):
+        return self.value > self.resolve(other)
+
+    def __ge__(self, other):
+        return self.value >= self.resolve(other)
+
+    def __hash__(self):
+        return hash(self.value)
+
+    def __len__(self):
+        return len(self.value)
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __getitem__(self, key):
+        return self.value[key]
+
+    def __contains__(self, item):
+        return item in self.value
+
+    def __str__(self):
+        return str(self.value)
+
+    def __bool__(self):
+        return bool(self.value)
+
+    def __repr__(self):
+        if self._converter:
+            return f'<Lazy {self._converter.__name__}({self._string!r})>'
+        return f'<Lazy {self._value!r}>'
+
+
+def deferred(converter, check=None):
+    """Defer conversions with given type converter until the value is used.
+
+    The returned type produces :class:`Lazy` values, so the (possibly
+    expensive) conversion is only run if the parsed value is accessed.
+    As errors of deferred conversion cannot be reported by the parser,
+    a cheap `check` can be given to reject invalid values at parse time.
+
+    Args:
+        converter: a callable accepting a single string
+        check: a predicate accepting the string; if it returns
+            a false value, the string is rejected immediately
+    """
+
+    def lazy_converter(string):
+        if check and not check(string):
+            raise ValueError(f'{string} rejected by {check.__name__}')
+        return Lazy(converter, string)
+
+    lazy_converter.__name__ = getattr(converter, '__name__', repr(converter))
+    return lazy_converter
+
+
+class PrefetchedFile:
+    """File which content is being read in background.
+
+    Calling `read()` blocks until the whole content is available.
+    """
+
+    def __init__(self, name, future):
+        self.name = name
+        self.future = future
+
+    def read(self):
+        return self.future.result()
+
+    def done(self):
+        return self.future.done()
+
+    def __repr__(self):
+        return f'<PrefetchedFile {self.name!r}>'
+
+
+class PrefetchedFileType:
+    """Factory for file arguments read in a pool of background threads.
+
+    Similarly to :class:`argparse.FileType`, the file is opened during
+    parsing (so an error will be shown if it is not accessible), but
+    instead of the file object a :class:`PrefetchedFile` is returned,
+    with the reading started in background straight away. This lets
+    the reading overlap with the rest of parsing, validation and
+    production (as well as with reading of the other files).
+
+    Example::
+
+        files = Argument(type=PrefetchedFileType('rb', max_workers=8), nargs='+')
+
+    Args:
+        mode: mode for opening the file, either 'r' or 'rb'
+        max_workers: how many files can be read concurrently
+        encoding: encoding to use in text mode
+    """
+
+    def __init__(self, mode='rb', max_workers=4, encoding=None):
+        if mode not in ('r', 'rb'):
+            raise ValueError(f'Only read modes are supported, not {mode}')
+        self.mode = mode
+        self.max_workers = max_workers
+        self.encoding = encoding
+        self._executor = None
+        self._lock = Lock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if not self._executor:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    @staticmethod
+    def read_and_close(file):
+        with file:
+            return file.read()
+
+    def __call__(self, string):
+        if string == '-':
+            file = sys.stdin.buffer if 'b' in self.mode else sys.stdin
+            return PrefetchedFile(string, self.executor.submit(file.read))
+        try:
+            file = open(string, self.mode, encoding=self.encoding)
+        except OSError as e:
+            raise ArgumentTypeError(f'can\'t open \'{string}\': {e}')
+        return PrefetchedFile(string, self.executor.submit(self.read_and_close, file))
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}({self.mode!r}, max_workers={self.max_workers})'
+
+
+def mapped_file(path):
+    """Open given file as read-only, memory-mapped buffer.
+
+    In contrast to :class:`argparse.FileType`, the content is not
+    read into memory: the pages are loaded by the operating system
+    on access. The returned :class:`mmap.mmap` object supports slicing
+    (so it can be used with :class:`Subset` types, e.g. `Slice`) and
+    can be wrapped in :class:`memoryview` for zero-copy access.
+
+    Empty files cannot be mapped, so an empty, read-only
+    :class:`memoryview` is returned for them instead.
+    """
+    try:
+        with open(path, 'rb') as file:
+            if not os.fstat(file.fileno()).st_size:
+                return memoryview(b'')
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError) as e:
+        raise ArgumentTypeError(f'can\'t map \'{path}\': {e}')
+
+
+class Stream:
+    """Values of an argument, converted one by one when iterated over.
+
+    A stream can be iterated over only once. Functions registered with
+    :meth:`defer` will be called (with the stream) after it is exhausted;
+    `count` holds the number of values read so far.
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.count = 0
+        self.exhausted = False
+        self.deferred_checks = []
+
+    def defer(self, check):
+        self.deferred_checks.append(check)
+
+    def __iter__(self):
+        for value in self.values:
+            self.count += 1
+            yield value
+        self.exhausted = True
+        for check in self.deferred_checks:
+            check(self)
+
+    def __repr__(self):
+        return f'<Stream of {self.count} values read so far>'
+
+
+def tokenize_stdin():
+    for line in sys.stdin:
+        yield from line.split()
+
+
+def tokenize_file(path, encoding='utf-8'):
+    with mapped_file(path) as mapped:
+        # the regular expressions can work on the memory-mapped buffer,
+        # so only a single token is copied into memory at a time
+        for match in re.finditer(rb'\S+', mapped):
+            yield match.group().decode(encoding)
+
+
+def streamed(item_type=str, encoding='utf-8'):
+    """Factory for arguments with (possibly very many) values streamed lazily.
+
+    The values are read from standard input if '-' is given, or from
+    a response file if the value starts with '@' (e.g. '@samples.txt').
+    Values have to be separated with whitespace. Other strings are
+    treated as a single value.
+
+    Values are converted to `item_type` during the iteration over
+    the produced :class:`Stream`, so the full list is never kept
+    in memory (and conversion errors surface only when iterating).
+    """
+
+    def stream(string):
+        if string == '-':
+            tokens = tokenize_stdin()
+        elif string.startswith('@'):
+            path = string[1:]
+            if not os.path.isfile(path):
+                raise ArgumentTypeError(f'can\'t open response file \'{path}\'')
+            tokens = tokenize_file(path, encoding)
+        else:
+            tokens = [string]
+        return Stream(map(item_type, tokens))
+
+    stream.__name__ = getattr(item_type, '__name__', repr(item_type))
+    return stream
+
+
+class Choices:
+    """Collection of allowed values, with hashed membership tests.
+
+    The choices can be given as a collection, or as a callable or
+    a path (:class:`os.PathLike`, with one choice per line) to be loaded
+    lazily - only when the membership is tested for the first time,
+    i.e. when the argument was actually given.
+
+    The `summary` is a short, truncated representation suitable
+    for help messages, which does not require loading the choices.
+    """
+
+    # how many choices should be shown in the summary
+    shown = 5
+
+    def __init__(self, source):
+        self.source = source
+        self._ordered = None
+        self._members = None
+        self._lock = Lock()
+
+    @property
+    def lazy(self):
+        return callable(self.source) or isinstance(self.source, os.PathLike)
+
+    def load(self):
+        if isinstance(self.source, os.PathLike):
+            with open(self.source) as file:
+                return [line.strip() for line in file if line.strip()]
+        if callable(self.source):
+            return list(self.source())
+        return list(self.source)
+
+    @property
+    def ordered(self):
+        with self._lock:
+            if self._ordered is None:
+                self._ordered = self.load()
+        return self._ordered
+
+    @property
+    def members(self):
+        if self._members is None:
+            try:
+                self._members = frozenset(self.ordered)
+            except TypeError:
+                # unhashable choices: fall back to a linear search
+                self._members = self.ordered
+        return self._members
+
+    def __contains__(self, value):
+        return value in self.members
+
+    def __iter__(self):
+        return iter(self.ordered)
+
+    def __len__(self):
+        return len(self.ordered)
+
+    @property
+    def summary(self):
+        if self.lazy and self._ordered is None:
+            source = self.source
+            name = getattr(source, 'name', None) or getattr(source, '__name__', 'choices')
+            return f'{{{name}}}'
+        shown = [str(choice) for choice in self.ordered[:self.shown]]
+        if len(self) > self.shown:
+            shown.append(f'... ({len(self)} choices)')
+        return '{' + ','.join(shown) + '}'
+
+    def __repr__(self):
+        return f'<Choices {self.summary}>'
+
+
+class Sweep(tuple):
+    """Values of an argument to sweep over, see :func:`swept`."""
+
+
+def swept(item_type=str, delimiter=','):
+    """Factory for arguments accepting a list of values to sweep over.
+
+    Values are delimiter separated (like with :func:`dsv`). For integer
+    arguments ranges are accepted too, using :class:`Range` notation
+    (i.e. '2-5' will be expanded to 2, 3, 4).
+    """
+
+    def sweep(string):
+        values = []
+        for value in string.split(delimiter):
+            if item_type is int and re.fullmatch(r'[0-9]+-[0-9]+', value):
+                values.extend(range(*Range(value).data))
+            else:
+                values.append(item_type(value))
+        return Sweep(values)
+
+    sweep.__name__ = getattr(item_type, '__name__', repr(item_type))
+    return sweep
+
+
 static = staticmethod
 
 
@@ -141,7 +574,10 @@ class Slice(Subset, StringHandlingMixin):
     separator = ':'
     item_type = int
 
-    data_type = static(one_of(n_tuple(2), n_tuple(3)))
+    data_type = static(one_of(
+        (n_tuple(2), lambda data: len(data) == 2),
+        (n_tuple(3), lambda data: len(data) == 3)
+    ))
 
     def get_iterator(self, iterable):
         return iterable[slice(*self.data)]
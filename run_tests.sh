@@ -1 +1 @@
-python3.6 -m pytest -x -vv --tb=long --cov=.
+python3 -m pytest -x -vv --tb=long --cov=.
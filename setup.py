@@ -21,7 +21,7 @@ if __name__ == '__main__':
         packages=find_packages(),
         version='0.1.3',
         license='MIT',
-        description=' Modern, declarative argument parser for Python 3.6+',
+        description=' Modern, declarative argument parser for Python 3.9+',
         long_description=get_long_description('README.md'),
         author='Michal Krassowski',
         author_email='krassowski.michal+pypi@gmail.com',
@@ -38,8 +38,10 @@ if __name__ == '__main__':
             'Topic :: Software Development :: User Interfaces',
             'Topic :: Software Development :: Libraries :: Python Modules',
             'Intended Audience :: Developers',
-            'Programming Language :: Python :: 3.6',
-            'Programming Language :: Python :: 3.7'
+            'Programming Language :: Python :: 3.9',
+            'Programming Language :: Python :: 3.10',
+            'Programming Language :: Python :: 3.11'
         ],
+        python_requires='>=3.9',
         install_requires=[],
     )
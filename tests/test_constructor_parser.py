@@ -1,3 +1,7 @@
+import sys
+from argparse import ArgumentTypeError
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 
 from declarative_parser.parser import Argument, Parser
@@ -123,6 +127,40 @@ def test_as_sub_parser(capsys):
         parse('output -h')
 
 
+def test_parse_into():
+
+    class OutputOptions:
+
+        def __init__(self, format='jpeg', scale: int=100):
+            self.format = format
+            self.scale = scale
+
+    class ImageConverter:
+
+        output = ConstructorParser(OutputOptions)
+
+        def __init__(self, path, verbose: bool=False, output=None, **kwargs):
+            self.path = path
+            self.output = output
+            self.kwargs = kwargs
+
+    parser = ConstructorParser(ImageConverter)
+    converter = parser.parse_into('image.png output --scale 50'.split())
+
+    assert converter.path == 'image.png'
+    assert isinstance(converter.output, OutputOptions)
+    assert converter.output.scale == 50
+    assert converter.kwargs == {}
+
+    # the builder is generated once
+    builder = parser._builder
+    converter = parser.parse_into(['other.png'])
+
+    assert parser._builder is builder
+    assert converter.output is None
+    assert ConstructorParser(ImageConverter).make_builder() is builder
+
+
 def test_function_parser():
 
     def calc_exponent(base: float, exponent: int=2):
@@ -143,6 +181,231 @@ def test_function_parser():
     assert get_result('2') == 2
 
 
+def test_parse_columns():
+
+    def scale(image, factor: float=1.0, repeat: int=1, mode='fast', labels=None, sizes=None):
+        return image, factor * repeat, mode, sizes
+
+    scale.mode = Argument(choices=['fast', 'slow'], default='fast')
+    scale.labels = Argument(nargs='*')
+    scale.sizes = Argument(type=int, nargs='*', as_many_as=scale.labels)
+
+    parser = FunctionParser(scale)
+
+    rows = parser.parse_columns({
+        'image': ['a.png', 'b.png'],
+        'factor': ['0.5', '2'],
+        'mode': ['slow', 'fast'],
+    })
+    results = [parser.constructor(**kwargs) for kwargs in rows]
+
+    assert results == [('a.png', 0.5, 'slow', None), ('b.png', 2.0, 'fast', None)]
+    assert type(results[0][1]) is float
+
+    with pytest.raises(ValueError, match='mode: invalid choice \'medium\' in row 1'):
+        parser.convert_columns({'image': ['a', 'b'], 'mode': ['fast', 'medium']})
+
+    with pytest.raises(ValueError, match='Column for required argument image is missing'):
+        parser.convert_columns({'factor': ['1']})
+
+    with pytest.raises(ValueError, match='sizes for 2 labels provided, expected for 1'):
+        parser.convert_columns({'image': ['a'], 'labels': [['x']], 'sizes': [['1', '2']]})
+
+    columns = parser.convert_columns({'image': ['a'], 'repeat': ['3']})
+    assert list(columns['repeat']) == [3]
+
+    with pytest.raises(ArgumentTypeError):
+        parser.convert_columns({'image': ['a'], 'repeat': ['x']})
+
+    columns = parser.convert_columns({'image': ['a'], 'repeat': ['99999999999999999999']})
+    assert list(columns['repeat']) == [99999999999999999999]
+
+    def resize(image, width: int='640'):
+        return image, width
+
+    columns = FunctionParser(resize).convert_columns({'image': ['a', 'b']})
+    assert columns['width'] == [640, 640]
+
+
+def train(lr: float=0.1, depth: int=2, label='model'):
+    return label, lr, depth
+
+
+train.lr = Argument(type=float, sweep=True, default=0.1)
+train.depth = Argument(type=int, sweep=True, default=2)
+
+
+def test_sweep():
+    parser = FunctionParser(train)
+    options = parser.parse_args('--lr 0.1,0.01 --depth 2-4,6'.split())
+
+    points = parser.sweep(options)
+    assert next(points).depth == 2
+    assert len(list(points)) == 2 * 3 - 1
+
+    expected = [
+        ('model', lr, depth)
+        for depth in [2, 3, 6]
+        for lr in [0.1, 0.01]
+    ]
+
+    for backend in ['thread', 'process']:
+        results = parser.run_sweep(options, workers=2, backend=backend, max_in_flight=2)
+        assert list(results) == expected
+
+    # not swept arguments are passed as-is
+    parser = FunctionParser(train)
+    options = parser.parse_args('--label other'.split())
+    assert list(parser.run_sweep(options, backend='thread')) == [('other', 0.1, 2)]
+
+
+def power(base: float, exponent: int=2):
+    return base ** exponent
+
+
+def test_map():
+    parser = FunctionParser(power)
+
+    argv_iterable = (
+        [str(base), '--exponent', str(exponent)]
+        for base in [2, 3]
+        for exponent in range(10)
+    )
+    expected = [base ** exponent for base in [2, 3] for exponent in range(10)]
+
+    results = parser.map(argv_iterable, workers=2, chunk_size=3, max_in_flight=2)
+    assert list(results) == expected
+
+    results = parser.map([['2'], ['3']], backend='thread', ordered=False)
+    assert sorted(results) == [4, 9]
+
+    # values from a previous parsing should not leak
+    results = parser.map([['2', '--exponent', '3'], ['2']], backend='thread', workers=1)
+    assert list(results) == [8, 4]
+
+
+def test_concurrent_construction_and_parsing():
+
+    class Output(Parser):
+        scale = Argument(type=int, default=100)
+
+    class Program(Parser):
+        files = Argument(nargs='*', default=[])
+        labels = Argument(nargs='*', default=[], as_many_as=files)
+        output = Output()
+
+    class Model:
+        rate = Argument(type=float)
+
+        def __init__(self, rate=0.1, layers: int=1):
+            """Model.
+
+            Args:
+                rate: the learning rate
+                layers: number of layers
+            """
+            self.rate = rate
+            self.layers = layers
+
+    def scale(image, labels=None, sizes=None):
+        return image, labels, sizes
+
+    scale.labels = Argument(nargs='*')
+    scale.sizes = Argument(type=int, nargs='*', as_many_as=scale.labels)
+
+    shared = [Program.files, Program.labels, Output.scale, Model.rate, scale.labels, scale.sizes]
+    before = [(argument.name, argument.help, dict(argument.kwargs)) for argument in shared]
+
+    def work(i):
+        options = Program().parse_args(
+            ['--files', 'a', 'b', '--labels', str(i), 'x', 'output', '--scale', str(i)]
+        )
+        assert (options.labels, options.output.scale) == ([str(i), 'x'], i)
+
+        model = ConstructorParser(Model).parse_into(['--rate', str(i), '--layers', '2'])
+        assert (model.rate, model.layers) == (float(i), 2)
+
+        parser = FunctionParser(scale)
+        options = parser.parse_args(['img', '--labels', 'a', '--sizes', str(i)])
+        assert options.sizes == [i]
+        return i
+
+    interval = sys.getswitchinterval()
+    # switch threads as often as possible (on builds with the GIL)
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            assert sorted(executor.map(work, range(200))) == list(range(200))
+    finally:
+        sys.setswitchinterval(interval)
+
+    # shared definitions were not modified by construction nor parsing
+    assert [(argument.name, argument.help, dict(argument.kwargs)) for argument in shared] == before
+    assert scale.labels.name is None
+
+    # but the help from docstring was attached to the parser's own copy
+    assert ConstructorParser(Model).arguments['rate'].help == 'the learning rate'
+
+
+def test_parameters_named_as_parser_attributes():
+
+    def run(validators: int = 1, cacheable: int = 2):
+        return validators, cacheable
+
+    parser = FunctionParser(run)
+    options = parser.parse_args(['--validators', '3', '--cacheable', '4'])
+    assert (options.validators, options.cacheable) == (3, 4)
+    assert parser.constructor(**vars(options)) == (3, 4)
+
+    def build(builder: int = 1, parse_into: int = 2):
+        return builder, parse_into
+
+    parser = FunctionParser(build)
+    assert parser.parse_into(['--builder', '3', '--parse_into', '4']) == (3, 4)
+
+
+def test_parameter_named_sweep():
+
+    def run(sweep: int = 1):
+        return sweep
+
+    parser = FunctionParser(run)
+    assert parser.parse_into(["--sweep", "2"]) == 2
+    # the method is still available
+    assert callable(parser.sweep)
+
+
+def test_parameters_named_as_execution_methods():
+
+    def run(map: int = 1, reset: int = 2, execute: int = 3):
+        return map, reset, execute
+
+    parser = FunctionParser(run)
+    assert parser.parse_into(["--map", "4", "--reset", "5", "--execute", "6"]) == (4, 5, 6)
+    assert list(parser.map([["--map", "7"]], backend="thread")) == [(7, 2, 3)]
+
+
+def test_parameter_named_stats():
+
+    def run(stats: bool = False):
+        return stats
+
+    parser = FunctionParser(run)
+    assert parser.parse_args(["--stats", "1"]).stats
+    with pytest.raises(RuntimeError, match="Profiling is disabled"):
+        parser.stats()
+
+
+def test_parameter_named_session():
+
+    def run(session: int = 1):
+        return session
+
+    parser = FunctionParser(run)
+    assert parser.parse_args(['--session', '2']).session == 2
+    assert parser.session(['--session', '3']).set('--session', '4').session == 4
+
+
 def test_analyze_docstring():
 
     google_docstring = """Some docstring.
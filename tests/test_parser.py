@@ -1,7 +1,19 @@
+import argparse
+import asyncio
+import gc
+import pickle
+import time
+import tracemalloc
+import warnings
+from io import StringIO
+
 import pytest
 
 from declarative_parser import Argument, Parser, action
-from declarative_parser.types import positive_int
+from declarative_parser.cache import cached_produce
+from declarative_parser.memory import allocation_budget
+from declarative_parser.parser import PrefixIndex
+from declarative_parser.types import mapped_file, positive_int
 
 from utilities import parsing_error
 from utilities import parsing_output
@@ -68,6 +80,764 @@ def test_arguments_interplay(capsys):
     assert opts.counts == [3, 1]
 
 
+def test_cached_argument():
+
+    class CachingParser(Parser):
+        counts = Argument(type=positive_int, nargs='*', cache=16)
+
+    parse = parse_factory(CachingParser)
+
+    assert parse('--counts 1 2 1').counts == [1, 2, 1]
+
+    with parsing_error(match='argument --counts: invalid positive_int value: \'-1\''):
+        parse('--counts -1')
+
+    info = CachingParser.counts.kwargs['type'].cache_info()
+    assert (info.hits, info.misses) == (1, 3)
+
+
+def test_lazy_argument():
+    converted = []
+
+    def load(path):
+        converted.append(path)
+        return path.upper()
+
+    class LazyParser(Parser):
+        data = Argument(type=load, lazy=True)
+        checked = Argument(type=load, lazy=str.isalpha)
+
+    parse = parse_factory(LazyParser)
+
+    opts = parse('--data abc --checked xyz')
+    assert converted == []
+
+    assert opts.data.value == 'ABC'
+    assert opts.data.lower() == 'abc'
+    assert converted == ['abc']
+
+    with parsing_error(match='argument --checked: invalid load value: \'x1\''):
+        parse('--checked x1')
+
+    class LazyPairs(Parser):
+        numbers = Argument(type=int, lazy=True, nargs='*')
+        names = Argument(type=str.split, lazy=True)
+        labels = Argument(nargs='*', as_many_as=numbers)
+        words = Argument(nargs='*', as_many_as=names)
+
+    opts = parse_factory(LazyPairs)('--numbers 1 2 --labels a b --names x,y --words p')
+    assert opts.numbers[0] == 1
+    assert opts.numbers == [1, 2]
+    assert str(opts.numbers[1]) == '2' and hash(opts.numbers[1]) == hash(2)
+    assert opts.names == ['x,y'] and len(opts.names) == 1 and 'x,y' in opts.names
+
+    with parsing_error(match='labels for 1 numbers provided, expected for 2'):
+        parse_factory(LazyPairs)('--numbers 1 2 --labels a')
+
+
+def test_streamed_argument(tmp_path, monkeypatch):
+
+    class SamplesParser(Parser):
+        samples = Argument(stream=True)
+        counts = Argument(type=positive_int, nargs='*', as_many_as=samples)
+        weights = Argument(type=float, stream=True, as_many_as=samples)
+
+    parse = parse_factory(SamplesParser)
+
+    response_file = tmp_path / 'samples.txt'
+    response_file.write_text('s1 s2\ns3\n')
+
+    mapped = []
+
+    def recording_mapped_file(path):
+        mapped.append(mapped_file(path))
+        return mapped[-1]
+
+    monkeypatch.setattr('declarative_parser.types.mapped_file', recording_mapped_file)
+
+    opts = parse(f'--samples @{response_file} --counts 1 2 3')
+    assert opts.samples.count == 0
+    assert list(opts.samples) == ['s1', 's2', 's3']
+    # the response file is unmapped once read
+    assert mapped[0].closed
+
+    empty_file = tmp_path / 'empty.txt'
+    empty_file.write_text('')
+    assert list(parse(f'--samples @{empty_file}').samples) == []
+
+    # validation is deferred until the stream is exhausted
+    opts = parse(f'--samples @{response_file} --counts 1 2')
+    with pytest.raises(ValueError, match='counts for 2 samples provided, expected for 3'):
+        list(opts.samples)
+
+    monkeypatch.setattr('sys.stdin', StringIO('0.5 0.25\n0.25\n'))
+    opts = parse(f'--samples @{response_file} --weights -')
+    assert list(opts.samples) == ['s1', 's2', 's3']
+    assert list(opts.weights) == [0.5, 0.25, 0.25]
+
+    with parsing_error(match='can\'t open response file'):
+        parse(f'--samples @{tmp_path / "missing.txt"}')
+
+
+def test_many_choices(capsys, tmp_path):
+    loaded = []
+
+    def load_datasets():
+        loaded.append(True)
+        return [f'dataset_{i}' for i in range(1000)]
+
+    names_file = tmp_path / 'names.txt'
+    names_file.write_text('alice\nbob\n')
+
+    class DatasetParser(Parser):
+        dataset = Argument(choices=load_datasets)
+        size = Argument(type=int, choices=range(100))
+        name = Argument(choices=names_file)
+
+    parse = parse_factory(DatasetParser)
+
+    assert parse('--size 5').size == 5
+    assert not loaded
+
+    assert parse('--dataset dataset_999').dataset == 'dataset_999'
+    assert loaded
+
+    assert parse('--name bob').name == 'bob'
+
+    with parsing_error(match='invalid choice: \'carol\''):
+        parse('--name carol')
+
+    # only a short summary of the choices is shown
+    with parsing_error(match=r'invalid choice: \'dataset_x\' \(choose from \{dataset_0,.*\(1000 choices\)\}\)\n$'):
+        parse('--dataset dataset_x')
+
+    with parsing_output(capsys, contains='--size {0,1,2,3,4,... (100 choices)}'):
+        parse('-h')
+
+
+def test_abbreviations():
+
+    class Resize(Parser):
+        scale = Argument(type=int)
+        size = Argument(type=int)
+
+    class Converter(Parser):
+        scaling = Argument(type=float)
+        resize = Resize()
+
+    class AbbreviatingConverter(Converter):
+        __abbreviate_subparsers__ = True
+
+    parse = parse_factory(Converter)
+
+    opts = parse('--scali 0.5 resize --sc=2 --si 3')
+    assert opts.scaling == 0.5
+    assert opts.resize.scale == 2
+    assert opts.resize.size == 3
+
+    with parsing_error(match='ambiguous option: --s could match --scale, --size'):
+        parse('resize --s 2')
+
+    class Figure(Parser):
+        height = Argument(type=int)
+
+    # as in argparse, --help counts when resolving abbreviations
+    with parsing_error(match='ambiguous option: --he could match --height, --help'):
+        parse_factory(Figure)('--he 2')
+    assert parse_factory(Figure)('--hei 2').height == 2
+
+    # internals do not shadow arguments named alike
+    class Internals(Parser):
+        option_index = Argument()
+        resolve = Argument()
+        other = Argument()
+
+    opts = parse_factory(Internals)('--option_index 1 --res 2 --oth 3')
+    assert (opts.option_index, opts.resolve, opts.other) == ('1', '2', '3')
+
+    # sub-parsers names are only abbreviated if explicitly enabled
+    with parsing_error(match='unrecognized arguments: res'):
+        parse('res --scale 2')
+
+    assert parse_factory(AbbreviatingConverter)('res --scale 2').resize.scale == 2
+
+    index = PrefixIndex(['--scale', '--scaling', '--size'])
+    assert index.matching('--scal') == ['--scale', '--scaling']
+    assert index.matching('--scale') == ['--scale']
+    assert index.matching('--x') == []
+
+
+def test_merged_views():
+
+    class Child(Parser):
+        __pull_to_namespace_above__ = True
+        lifted = Argument()
+
+    class Root(Parser):
+        own = Argument()
+        child = Child()
+
+    parser = Root()
+
+    assert list(parser.all_arguments) == ['own', 'lifted']
+    assert parser.all_arguments is parser.all_arguments
+
+    with pytest.raises(TypeError):
+        parser.all_arguments['other'] = Argument()
+
+    # reading the views should not allocate new dicts
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        views = [
+            (parser.all_arguments, parser.all_subparsers)
+            for _ in range(1000)
+        ]
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    parser_file = Parser.__init__.__code__.co_filename
+    allocated = sum(
+        stat.size_diff
+        for stat in after.compare_to(before, 'filename')
+        if stat.traceback[0].filename == parser_file
+    )
+    assert allocated < 1000
+    assert len(views) == 1000
+
+    # parsing does not re-merge the views (nor retain memory between parses)
+    args = ['--own', 'a', '--lifted', 'b']
+    parser.parse_args(args)
+
+    tracemalloc.start()
+    try:
+        gc.collect()
+        before = tracemalloc.take_snapshot()
+        for _ in range(100):
+            parser.reset()
+            parser.parse_args(args)
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    allocated = sum(
+        stat.size_diff
+        for stat in after.compare_to(before, 'filename')
+        if stat.traceback[0].filename == parser_file
+    )
+    assert allocated < 1000
+
+    # and a single parse allocates little at peak
+    with allocation_budget(16 * 2 ** 10):
+        parser.parse_args(args)
+
+    # binding updates the views
+    parser.bind_argument(Argument(), 'new')
+    assert 'new' in parser.all_arguments
+
+
+def test_compact_namespace():
+
+    class Output(Parser):
+        format = Argument(default='jpeg')
+        scale = Argument(type=int, default=100)
+
+    class Converter(Parser):
+        __compact_namespace__ = True
+
+        verbose = Argument(action='store_true')
+        output = Output()
+
+    opts = parse_factory(Converter)('--verbose output --scale 50')
+
+    assert opts.verbose is True
+    assert opts.output.scale == 50
+    assert vars(opts.output) == {'format': 'jpeg', 'scale': 50}
+    assert not hasattr(opts, '__weakref__')
+
+    with pytest.raises(AttributeError):
+        opts.undefined = 1
+
+    assert type(opts) is type(parse_factory(Converter)('output'))
+
+    assert opts != None and opts != 1
+    assert opts in [None, opts]
+    assert opts == pickle.loads(pickle.dumps(opts))
+
+    # records can be sent back from the worker processes
+    results = Converter().map([['output', '--scale', '5'], ['output', '--format', 'png']], workers=2)
+    assert [vars(opts.output) for opts in results] == [
+        {'format': 'jpeg', 'scale': 5}, {'format': 'png', 'scale': 100}
+    ]
+
+    assert not hasattr(Argument(), '__dict__')
+
+
+def test_parse_args_async():
+    delay = 0.2
+
+    async def handle(reader, writer):
+        request = await reader.readline()
+        await asyncio.sleep(delay)
+        writer.write(request.upper())
+        await writer.drain()
+        writer.close()
+
+    async def parse(commands):
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+
+        async def resolve(name):
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(name.encode() + b'\n')
+            response = await reader.readline()
+            writer.close()
+            if response.strip() == b'MISSING':
+                raise ValueError(f'{name} not found')
+            return response.decode().strip()
+
+        class Registry(Parser):
+            sources = Argument(type=resolve, nargs='*')
+            target = Argument(type=resolve)
+            count = Argument(type=int, default=1)
+
+            async def produce(self, unknown_args):
+                opts = self.namespace
+                opts.summary = f'{opts.sources} -> {opts.target} x{opts.count}'
+                return opts
+
+        async with server:
+            return await Registry().parse_args_async(commands.split())
+
+    start = time.perf_counter()
+    opts = asyncio.run(parse('--sources a b --target c --count 2'))
+    elapsed = time.perf_counter() - start
+
+    assert opts.sources == ['A', 'B']
+    assert opts.summary == "['A', 'B'] -> C x2"
+    # the three conversions should overlap
+    assert elapsed < 2 * delay
+
+    with parsing_error(match='argument target: missing not found'):
+        asyncio.run(parse('--target missing'))
+
+    async def upper(name):
+        return name.upper()
+
+    class Blocking(Parser):
+        target = Argument(type=upper)
+        sources = Argument(type=upper, nargs='*')
+
+    class Producing(Parser):
+        async def produce(self, unknown_args):
+            return self.namespace
+
+    # the synchronous parse_args does not leave coroutines un-awaited
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        with pytest.raises(TypeError, match=r'coroutine converters require parse_args_async\(\)'):
+            Blocking().parse_args(['--target', 'c'])
+        with pytest.raises(TypeError, match=r'coroutine converters require parse_args_async\(\)'):
+            Blocking().parse_args(['--sources', 'a', 'b'])
+        with pytest.raises(TypeError, match=r'coroutine produce\(\) require parse_args_async\(\)'):
+            Producing().parse_args([])
+
+    # internals do not shadow arguments named alike
+    class Named(Parser):
+        parse_all_args = Argument(type=upper)
+        resolve_awaitables = Argument()
+
+    opts = asyncio.run(Named().parse_args_async(['--parse_all_args', 'a', '--resolve_awaitables', 'b']))
+    assert (opts.parse_all_args, opts.resolve_awaitables) == ('A', 'b')
+
+
+def test_concurrent_produce():
+    delay = 0.2
+    events = []
+
+    class Loader(Parser):
+        path = Argument()
+
+        def produce(self, unknown_args):
+            events.append(('start', self.parser_name))
+            time.sleep(delay)
+            self.namespace.loaded = f'<{self.namespace.path}>'
+            events.append(('end', self.parser_name))
+            return self.namespace
+
+    class Indexer(Loader):
+        __produce_after__ = ['model']
+
+    class Pipeline(Parser):
+        __produce_workers__ = 4
+
+        model = Loader()
+        data = Loader()
+        index = Indexer()
+
+    parse = parse_factory(Pipeline)
+
+    start = time.perf_counter()
+    opts = parse('model --path m data --path d index --path i')
+    elapsed = time.perf_counter() - start
+
+    assert (opts.model.loaded, opts.data.loaded, opts.index.loaded) == ('<m>', '<d>', '<i>')
+    # model and data are independent, index waits for model only
+    assert elapsed < 2.5 * delay
+    assert events.index(('end', 'model')) < events.index(('start', 'index'))
+
+    class SequentialPipeline(Pipeline):
+        __produce_workers__ = None
+
+    opts = parse_factory(SequentialPipeline)('model --path m data --path d')
+    assert (opts.model.loaded, opts.data.loaded, opts.index) == ('<m>', '<d>', None)
+
+    class CyclicPipeline(Pipeline):
+        model = Indexer()
+        index = Indexer()
+
+    with pytest.raises(ValueError, match=r'Cyclic dependencies of produce\(\) in: index, model'):
+        parse_factory(CyclicPipeline)('model --path m index --path i')
+
+    # internals do not shadow arguments named alike
+    class CheckedLoader(Loader):
+        run_checked = Argument()
+
+    class NamedPipeline(Pipeline):
+        run_productions = Argument()
+        model = CheckedLoader()
+
+    opts = parse_factory(NamedPipeline)('--run_productions r model --path m --run_checked c')
+    assert (opts.run_productions, opts.model.run_checked, opts.model.loaded) == ('r', 'c', '<m>')
+
+
+def test_cached_produce(tmp_path):
+    built = []
+
+    class ReferenceIndex(Parser):
+        reference = Argument()
+        log = Argument(type=argparse.FileType('w'))
+
+        @cached_produce(directory=tmp_path, max_size=150, ignore=['log'])
+        def produce(self, unknown_args):
+            built.append(self.namespace.reference)
+            self.namespace.index = {'reference': self.namespace.reference}
+            return self.namespace
+
+    parse = parse_factory(ReferenceIndex)
+
+    for reference in ['a', 'b', 'a', 'a']:
+        assert parse(f'--reference {reference}').index == {'reference': reference}
+
+    assert built == ['a', 'b']
+
+    # least recently used products are removed when above the size limit
+    for reference in ['c', 'd', 'e', 'f']:
+        parse(f'--reference {reference}')
+
+    assert sum(path.stat().st_size for path in tmp_path.iterdir()) <= 150
+    assert not list(tmp_path.glob('*.tmp'))
+
+    parse('--reference a')
+    assert built[-1] == 'a'
+
+
+def test_parse_cache(tmp_path):
+    produced = []
+
+    class Greetings(Parser):
+        __parse_cache_size__ = 2
+
+        name = Argument()
+        count = Argument(type=int, default=1)
+
+        def produce(self, unknown_args):
+            produced.append(self.namespace.name)
+            self.namespace.greetings = [f'Hello {self.namespace.name}!'] * self.namespace.count
+            return self.namespace
+
+    parser = Greetings()
+
+    first = parser.parse_args(['--name', 'joe'])
+    first.greetings.append('modified')
+
+    second = parser.parse_args(['--name', 'joe'])
+    assert second.greetings == ['Hello joe!']
+    assert second is not parser.parse_args(['--name', 'joe'])
+
+    # results do not depend on the previous parsing
+    assert parser.parse_args(['--count', '2']).name is None
+
+    assert produced == ['joe', None]
+    assert parser.parse_cache_info() == (2, 2, 2, 2)
+
+    # least recently used result is evicted
+    parser.parse_args(['--name', 'ann'])
+    parser.parse_args(['--name', 'ann'])
+    parser.parse_args(['--name', 'joe'])
+    assert produced == ['joe', None, 'ann', 'joe']
+
+    # changes in the tree invalidate the cache
+    parser.bind_parser(Parser(), 'extra')
+    parser.parse_args(['--name', 'ann'])
+    assert produced == ['joe', None, 'ann', 'joe', 'ann']
+
+    class Logger(Greetings):
+        log = Argument(type=argparse.FileType('w'))
+
+    parser = Logger()
+    assert not parser._cacheable
+
+    path = str(tmp_path / 'log.txt')
+    parser.parse_args(['--log', path])
+    parser.parse_args(['--log', path])
+    assert parser.parse_cache_info().currsize == 0
+
+
+    # internals do not shadow arguments named alike
+    class Shadowing(Parser):
+        __parse_cache_size__ = 2
+
+        parse_cache = Argument(type=int)
+        cacheable = Argument(type=int)
+        tree_version = Argument(type=int)
+
+    parser = Shadowing()
+    for _ in range(2):
+        opts = parser.parse_args(['--parse_cache', '1', '--cacheable', '2', '--tree_version', '3'])
+        assert (opts.parse_cache, opts.cacheable, opts.tree_version) == (1, 2, 3)
+    assert parser.parse_cache_info().hits == 1
+
+def test_validators():
+
+    class Files(Parser):
+        files = Argument(nargs='*', default=[])
+        names = Argument(nargs='*', default=[], as_many_as=files)
+        labels = Argument(nargs='*', default=[], as_many_as=names)
+        verbose = Argument(action='store_true')
+
+    parser = Files()
+    # only the arguments with checks, in the order of dependencies
+    assert [argument.name for argument in parser._ordered_validators] == ['names', 'labels']
+
+    with pytest.raises(SystemExit):
+        parser.parse_args(['--files', 'a', '--names', 'x', '--labels', 'l', 'm'])
+
+    parser = Files()
+    opts = parser.parse_args(['--files', 'a', '--names', 'x', '--labels', 'l'])
+    assert opts.labels == ['l']
+
+    class Plain(Parser):
+        verbose = Argument(action='store_true')
+
+    assert not Plain()._needs_validation
+
+    names = Argument(nargs='*')
+    labels = Argument(nargs='*', as_many_as=names)
+    names.as_many_as = labels
+
+    class Cyclic(Parser):
+        pass
+
+    parser = Cyclic()
+    parser.bind_argument(names, 'names')
+    parser.bind_argument(labels, 'labels')
+
+    with pytest.raises(ValueError, match='Cyclic as_many_as dependencies: names -> labels -> names'):
+        parser._ordered_validators
+
+    # internals do not shadow arguments named alike
+    class Checks(Parser):
+        validators = Argument(nargs='*', default=[])
+        needs_validation = Argument(action='store_true')
+
+    opts = Checks().parse_args(['--validators', 'a', 'b', '--needs_validation'])
+    assert opts.validators == ['a', 'b']
+    assert opts.needs_validation
+
+
+def test_session():
+    produced = []
+
+    class Output(Parser):
+        format = Argument(default='png', choices=['png', 'gif'])
+        scale = Argument(type=int, default=100)
+
+        def produce(self, unknown_args):
+            produced.append('output')
+            self.namespace.size = self.namespace.scale * 2
+            return self.namespace
+
+    class Input(Parser):
+        files = Argument(nargs='*', default=[])
+        labels = Argument(nargs='*', default=[], as_many_as=files)
+
+        def produce(self, unknown_args):
+            produced.append('input')
+            return self.namespace
+
+    class Program(Parser):
+        output = Output()
+        input = Input()
+        verbose = Argument(action='store_true')
+
+    session = Program().session(['output', '--scale', '10', 'input'])
+    produced.clear()
+
+    namespace = session.set('--scale', '50')
+    assert namespace.output.scale == 50
+    assert namespace.output.size == 100
+    # only the affected sub-parser re-runs produce
+    assert produced == ['output']
+
+    session.set('--verbose')
+    assert namespace.verbose
+
+    with pytest.raises(argparse.ArgumentError):
+        session.set('--format', 'bmp')
+    with pytest.raises(argparse.ArgumentError):
+        session.set('--scale', 'big')
+
+    # dependent arguments are re-validated
+    session.set('--files', 'a.txt', 'b.txt')
+    with pytest.raises(ValueError, match='labels'):
+        session.set('--labels', 'a')
+    session.set('--labels', 'a', 'b')
+    assert namespace.input.labels == ['a', 'b']
+
+    with pytest.raises(ValueError, match='Unknown'):
+        session.set('--unknown', '1')
+
+    class Limited(Parser):
+        a = Argument(type=int, default=1)
+
+        def validate(self, opts):
+            super().validate(opts)
+            if opts.a > 10:
+                raise ValueError('a has to be at most 10')
+
+    class Main(Parser):
+        limited = Limited()
+
+    session = Main().session(['limited'])
+    session.set('--a', '5')
+    with pytest.raises(ValueError, match='at most 10'):
+        session.set('--a', '50')
+
+
+def test_argument_named_reset():
+
+    class Restart(Parser):
+        __parse_cache_size__ = 4
+
+        reset = Argument(action='store_true')
+        name = Argument()
+
+    parser = Restart()
+
+    assert parser.parse_args(['--reset', '--name', 'a']).reset
+    assert not parser.parse_args(['--name', 'b']).reset
+    assert parser.parse_args(['--reset', '--name', 'a']).name == 'a'
+    assert parser.parse_cache_info().hits == 1
+
+    session = parser.session(['--reset'])
+    session.set('--name', 'c')
+    assert session.namespace.reset and session.namespace.name == 'c'
+
+    results = parser.map([['--name', 'x'], ['--reset']], backend='thread', workers=1)
+    assert [(bool(opts.reset), opts.name) for opts in results] == [(False, 'x'), (True, None)]
+
+
+def test_stats(tmp_path):
+
+    class Output(Parser):
+        scale = Argument(type=int, default=100)
+
+        def produce(self, unknown_args):
+            self.namespace.size = self.namespace.scale * 2
+            return self.namespace
+
+    class Program(Parser):
+        __profile__ = True
+
+        output = Output()
+        verbose = Argument(action='store_true')
+
+    parser = Program()
+    parser.parse_args(['--verbose', 'output', '--scale', '50'])
+
+    stats = parser.stats()
+
+    phases = stats.by_phase()
+    for phase in ['bind', 'deepcopy', 'to_builtin_parser', 'parse_args', 'group_arguments', 'argparse', 'produce']:
+        assert phase in phases
+
+    calls, wall, cpu = phases['convert scale']
+    assert calls == 1
+    assert wall >= 0 and cpu >= 0
+
+    assert {'Program', 'output'} <= set(stats.by_node())
+
+    path = tmp_path / 'parser.folded'
+    stats.write_collapsed(path)
+    lines = path.read_text().splitlines()
+    assert 'Program:parse_args;Program:group_arguments' in {line.rsplit(' ', 1)[0] for line in lines}
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+    # converters keep their names for error messages
+    with pytest.raises(SystemExit):
+        parser.parse_args(['output', '--scale', 'big'])
+
+    with pytest.raises(RuntimeError):
+        Output().stats()
+
+    # internals do not shadow arguments named alike
+    class Timed(Parser):
+        __profile__ = True
+
+        measure = Argument(action='store_true')
+        node_name = Argument()
+
+    parser = Timed()
+    opts = parser.parse_args(['--measure', '--node_name', 'x'])
+    assert opts.measure and opts.node_name == 'x'
+    assert 'Timed' in parser.stats().by_node()
+
+
+def test_memory_report():
+
+    class Output(Parser):
+        scale = Argument(type=int, default=100, help='Rescale image to % of original size' * 100)
+
+    class Program(Parser):
+        output = Output()
+        data = Argument(default='x' * 10000)
+
+    parser = Program()
+    parser.parse_args(['output', '--scale', '50'])
+
+    report = parser.memory_report()
+    assert list(report) == ['Program', 'Program output']
+
+    program, output = report.values()
+    assert program.arguments > 10000
+    assert output.help > 3000
+    assert output.argparse and output.namespace
+    assert report.total == program.total + output.total
+    assert 'Program output' in str(report)
+
+    with allocation_budget(2 ** 20):
+        parser = Program()
+    with allocation_budget(50 * 2 ** 10):
+        parser.parse_args(['output', '--scale', '50'])
+
+    with pytest.raises(AssertionError, match='above the budget'):
+        with allocation_budget(1000):
+            parser = Program()
+
+
 def test_parallel(capsys):
 
     supported_formats = ['png', 'jpeg', 'gif']
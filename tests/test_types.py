@@ -5,6 +5,10 @@ import pytest
 from declarative_parser.types import Slice, Range
 from declarative_parser.types import Indices
 from declarative_parser.types import positive_int
+from declarative_parser.types import one_of
+from declarative_parser.types import cached
+from declarative_parser.types import PrefetchedFileType
+from declarative_parser.types import mapped_file
 
 
 def check_type_cases(type_callable, cases, items):
@@ -81,3 +85,100 @@ def test_positive_int():
         positive_int('-5')
 
     assert positive_int('5') == 5
+
+
+def test_one_of():
+    calls = []
+
+    def tracked(type_constructor):
+        def constructor(string):
+            calls.append(type_constructor.__name__)
+            return type_constructor(string)
+        constructor.__name__ = type_constructor.__name__
+        return constructor
+
+    number = one_of(
+        (tracked(int), r'-?\d+'),
+        (tracked(float), lambda string: '.' in string),
+        tracked(Range)
+    )
+
+    assert number('-5') == -5
+    assert number('0.5') == 0.5
+    assert number('2-5').get([0, 1, 2, 3, 4, 5]) == [2, 3, 4]
+
+    # constructors rejected by guards should never be called
+    assert calls == ['int', 'float', 'Range']
+
+    with pytest.raises(ArgumentTypeError, match='int: rejected by guard'):
+        number('x')
+
+
+def test_cached():
+    calls = []
+
+    def expensive(value):
+        calls.append(value)
+        return int(value)
+
+    converter = cached(expensive, maxsize=2)
+
+    assert converter.__name__ == 'expensive'
+    assert [converter(v) for v in ['1', '2', '1', '1']] == [1, 2, 1, 1]
+    assert calls == ['1', '2']
+
+    # '2' is the least recently used, so it will be evicted
+    converter('3')
+    converter('2')
+    assert calls == ['1', '2', '3', '2']
+
+    info = converter.cache_info()
+    assert (info.hits, info.misses) == (2, 4)
+
+    cached_slice = cached(Slice)
+    assert cached_slice('2:5') is cached_slice('2:5')
+    assert cached_slice('2:5').get(list(range(10))) == [2, 3, 4]
+
+
+def test_prefetched_file(tmp_path):
+    paths = []
+    for i in range(5):
+        path = tmp_path / f'{i}.txt'
+        path.write_text(f'content {i}')
+        paths.append(str(path))
+
+    binary_file = PrefetchedFileType('rb', max_workers=2)
+    files = [binary_file(path) for path in paths]
+
+    assert [file.read() for file in files] == [
+        f'content {i}'.encode() for i in range(5)
+    ]
+    assert files[0].name == paths[0]
+
+    assert PrefetchedFileType('r')(paths[1]).read() == 'content 1'
+
+    with pytest.raises(ArgumentTypeError, match='can\'t open'):
+        binary_file(str(tmp_path / 'missing.txt'))
+
+
+def test_mapped_file(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'0123456789')
+
+    mapped = mapped_file(str(path))
+
+    assert Slice('2:5').get_iterator(mapped) == b'234'
+    assert bytes(memoryview(mapped)[7:]) == b'789'
+
+    with pytest.raises(TypeError):
+        mapped[0:1] = b'x'
+
+    (tmp_path / 'empty.bin').write_bytes(b'')
+
+    empty = mapped_file(str(tmp_path / 'empty.bin'))
+    assert bytes(empty) == b''
+    assert Slice('2:5').get_iterator(empty) == b''
+    assert empty.readonly
+
+    with pytest.raises(ArgumentTypeError, match='can\'t map'):
+        mapped_file(str(tmp_path / 'missing.bin'))